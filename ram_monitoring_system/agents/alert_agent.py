@@ -5,30 +5,28 @@ PERCEIVES: RAM_HIGH / RAM_NORMAL messages from the bus
 ACTS: Shows popup + plays sound
 """
 
-import time
-import threading
 from core.base_agent import BaseAgent
 from core.message_bus import MessageBus
 
 
 class AlertAgent(BaseAgent):
 
-    def __init__(self, bus: MessageBus):
+    def __init__(self, bus: MessageBus, headless=False):
         super().__init__("AlertAgent", bus)
+        self.headless = headless    # Console only, no tkinter popup
         self.bus.subscribe("RAM_HIGH", self.on_ram_high)
         self.bus.subscribe("RAM_NORMAL", self.on_ram_normal)
 
     def run(self):
         print(f"[{self.name}] Ready. Waiting for events...")
-        while True:
-            time.sleep(1)
 
     def on_ram_high(self, message):
         ram = message.payload["ram_percent"]
         processes = message.payload["top_processes"]
         print(f"[{self.name}] ⚠ RAM HIGH ({ram}%) — showing alert!")
         self.play_sound()
-        self.show_popup(ram, processes)
+        if not self.headless:
+            self.show_popup(ram, processes)
 
     def on_ram_normal(self, message):
         ram = message.payload["ram_percent"]
@@ -64,5 +62,5 @@ if __name__ == "__main__":
     from core.message_bus import MessageBus
     bus = MessageBus()
     agent = AlertAgent(bus)
-    threading.Thread(target=bus.start_routing, daemon=True).start()
-    agent.run()
\ No newline at end of file
+    agent.run()
+    bus.start_routing()
\ No newline at end of file
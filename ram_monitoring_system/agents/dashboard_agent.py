@@ -1,17 +1,22 @@
 """
 Dashboard Agent
 
-PERCEIVES: RAM_DATA, RAM_HIGH, RAM_NORMAL messages from the bus
+PERCEIVES: RAM_DATA, RAM_DATA.<host>, RAM_HIGH, RAM_NORMAL, RAM_BREACH_PREDICTED,
+           PROCESS_LEAK_SUSPECTED messages from the bus
 ACTS: Serves live RAM data via Flask API
 """
 
-import time
 import threading
 import logging
 from flask import Flask, jsonify, render_template_string
+from core.async_bus import nonblocking
 from core.base_agent import BaseAgent
 from core.message_bus import MessageBus
 
+# ============ CONFIGURATION ============
+MAX_LEAK_SUSPECTS = 5       # Leak suspects listed in /api/status
+FORECAST_GRACE = 60         # Seconds a breach forecast stays listed past its due time
+
 app = Flask(__name__)
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
@@ -21,15 +26,28 @@ class DashboardAgent(BaseAgent):
     def __init__(self, bus: MessageBus):
         super().__init__("DashboardAgent", bus)
         self.bus.subscribe("RAM_DATA", self.on_ram_data)
+        self.bus.subscribe("RAM_DATA.*", self.on_host_data)
         self.bus.subscribe("RAM_HIGH", self.on_ram_high)
         self.bus.subscribe("RAM_NORMAL", self.on_ram_normal)
+        self.bus.subscribe("RAM_BREACH_PREDICTED", self.on_breach_predicted)
+        self.bus.subscribe("PROCESS_LEAK_SUSPECTED", self.on_leak_suspected)
 
         # Latest data storage
         self.latest = {
             "ram_percent": 0,
+            "ram_min": None,
+            "ram_max": None,
+            "pressure": None,       # PSI / swap / cgroup readings (Linux)
             "top_processes": [],
+            "top_groups": [],
+            "leak_suspects": [],    # Most recent first
+            "forecast": None,       # Pending RAM_BREACH_PREDICTED
             "status": "normal"
         }
+        # Until when the forecast stands if no breach follows
+        self.forecast_expires = 0.0
+        # Latest RamSample per remote or simulated host
+        self.hosts = {}
 
     def run(self):
         print(f"[{self.name}] Starting dashboard on http://localhost:5000")
@@ -38,19 +56,46 @@ class DashboardAgent(BaseAgent):
             target=lambda: app.run(port=5000, debug=False, use_reloader=False),
             daemon=True
         ).start()
-        while True:
-            time.sleep(1)
 
 
+    @nonblocking
     def on_ram_data(self, message):
-        self.latest["ram_percent"] = message.payload["ram_percent"]
-        self.latest["top_processes"] = message.payload["top_processes"]
-
+        sample = message.payload
+        self.latest["ram_percent"] = sample.ram_percent
+        self.latest["ram_min"] = sample.ram_min
+        self.latest["ram_max"] = sample.ram_max
+        self.latest["pressure"] = sample.pressure
+        self.latest["top_processes"] = sample.top_processes
+        self.latest["top_groups"] = sample.top_groups or []
+        if self.latest["forecast"] is not None and message.wall_time > self.forecast_expires:
+            self.latest["forecast"] = None
+
+    @nonblocking
+    def on_host_data(self, message):
+        # "RAM_DATA.web-01" -> "web-01"
+        self.hosts[message.event_type[len("RAM_DATA."):]] = message.payload
+
+    @nonblocking
+    def on_leak_suspected(self, message):
+        leak = message.payload
+        others = [s for s in self.latest["leak_suspects"] if s.pid != leak.pid]
+        self.latest["leak_suspects"] = [leak] + others[:MAX_LEAK_SUSPECTS - 1]
+
+    @nonblocking
+    def on_breach_predicted(self, message):
+        forecast = message.payload
+        self.latest["forecast"] = forecast
+        self.forecast_expires = message.wall_time + forecast.seconds_to_breach + FORECAST_GRACE
+
+    @nonblocking
     def on_ram_high(self, message):
         self.latest["status"] = "high"
+        self.latest["forecast"] = None
 
+    @nonblocking
     def on_ram_normal(self, message):
         self.latest["status"] = "normal"
+        self.latest["forecast"] = None
 
 
 @app.route('/api/status')
@@ -59,6 +104,24 @@ def status():
     return jsonify(agent.latest)
 
 
+@app.route('/api/hosts')
+def hosts():
+    agent = app.config['agent']
+    return jsonify(dict(agent.hosts))
+
+
+@app.route('/api/lanes')
+def lanes():
+    agent = app.config['agent']
+    return jsonify(agent.bus.lane_stats())
+
+
+@app.route('/api/metrics')
+def metrics():
+    agent = app.config['agent']
+    return jsonify(agent.bus.metrics_snapshot())
+
+
 @app.route('/')
 def index():
     return render_template_string(HTML)
@@ -630,6 +693,10 @@ HTML = """
                         <span class="stat-label">Threshold</span>
                         <span class="stat-value" id="threshold">50%</span>
                     </div>
+                    <div class="stat-row">
+                        <span class="stat-label">Min / Max</span>
+                        <span class="stat-value" id="ramRange">—</span>
+                    </div>
                     <div class="stat-row">
                         <span class="stat-label">High Since</span>
                         <span class="stat-value" id="highSince">—</span>
@@ -899,6 +966,10 @@ HTML = """
                     document.getElementById('highSince').textContent = '—';
                 }
 
+                // Spread of the high-resolution samples since the last tick
+                document.getElementById('ramRange').textContent = data.ram_max === null
+                    ? '—' : data.ram_min + '% / ' + data.ram_max + '%';
+
                 document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString('en-GB');
                 document.getElementById('threshold').textContent = THRESHOLD + '%';
             })
@@ -1,12 +1,11 @@
 """
 Email Agent
 
-PERCEIVES: SEND_EMAIL messages from the bus
+PERCEIVES: SEND_EMAIL, RAM_BREACH_PREDICTED messages from the bus
 ACTS: Sends email alert
 """
 
 import os
-import time
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -22,6 +21,7 @@ class EmailAgent(BaseAgent):
     def __init__(self, bus: MessageBus):
         super().__init__("EmailAgent", bus)
         self.bus.subscribe("SEND_EMAIL", self.on_send_email)
+        self.bus.subscribe("RAM_BREACH_PREDICTED", self.on_breach_predicted)
 
         self.smtp_server = "smtp.gmail.com"
         self.smtp_port = int(os.getenv("SMTP_PORT", 587))
@@ -31,8 +31,6 @@ class EmailAgent(BaseAgent):
 
     def run(self):
         print(f"[{self.name}] Ready. Waiting for events...")
-        while True:
-            time.sleep(1)
 
     def on_send_email(self, message):
         ram = message.payload["ram_percent"]
@@ -40,7 +38,17 @@ class EmailAgent(BaseAgent):
         print(f"[{self.name}] 📧 Received SEND_EMAIL — sending email!")
         self.send_email(ram, processes)
 
-    def send_email(self, ram_percent, top_processes):
+    def on_breach_predicted(self, message):
+        forecast = message.payload
+        print(f"[{self.name}] 📧 Received RAM_BREACH_PREDICTED — sending early warning!")
+        self.send_email(
+            forecast["ram_percent"], forecast["top_processes"],
+            subject=f"⚠️ RAM FORECAST: {forecast['threshold']}% in ~{forecast['seconds_to_breach']:.0f}s",
+            headline=(f"RAM USAGE IS RISING BY {forecast['trend_per_min']}% PER MINUTE AND IS EXPECTED "
+                      f"TO REACH {forecast['threshold']}% IN ABOUT {forecast['seconds_to_breach']:.0f} SECONDS!")
+        )
+
+    def send_email(self, ram_percent, top_processes, subject=None, headline="HIGH RAM USAGE DETECTED!"):
         if not self.sender or not self.password:
             print(f"[{self.name}] ✗ Email credentials not found in .env file!")
             return
@@ -48,10 +56,10 @@ class EmailAgent(BaseAgent):
         msg = MIMEMultipart()
         msg['From'] = self.sender
         msg['To'] = self.recipient
-        msg['Subject'] = f"⚠️ HIGH RAM ALERT: {ram_percent}%"
+        msg['Subject'] = subject or f"⚠️ HIGH RAM ALERT: {ram_percent}%"
 
         body = f"""
-HIGH RAM USAGE DETECTED!
+{headline}
 
 Current RAM Usage: {ram_percent}%
 
@@ -83,8 +91,7 @@ This is an automated alert from RAM Monitor System
 # ============ STANDALONE TEST ============
 if __name__ == "__main__":
     from core.message_bus import MessageBus
-    import threading
     bus = MessageBus()
     agent = EmailAgent(bus)
-    threading.Thread(target=bus.start_routing, daemon=True).start()
-    agent.run()
\ No newline at end of file
+    agent.run()
+    bus.start_routing()
\ No newline at end of file
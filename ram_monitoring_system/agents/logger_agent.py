@@ -1,15 +1,26 @@
+import asyncio
 import psutil
-import csv
 import time
 import threading
 from datetime import datetime
-import os
+from core.async_bus import nonblocking
 from core.base_agent import BaseAgent
-from core.message_bus import MessageBus
+from core.log_writer import CsvLogWriter
+from core.message_bus import MessageBus, KEEP_ALL
+from core.timeseries import TimeSeriesStore
 
 
 THRESHOLD = 80
 LOG_FILE = "ram_log.csv"
+SNAPSHOT_INTERVAL = 6 * 60 * 60
+HEADER = ["Timestamp", "Event", "RAM%", "Details", "Top Processes"]
+FLUSH_INTERVAL = 1.0    # Longest a logged row waits in memory
+FSYNC_INTERVAL = None   # Seconds between fsyncs; None = leave it to the OS
+MAX_LOG_BYTES = 10 * 1024 * 1024    # Roll ram_log.csv over past this size (None = never)
+ROTATE_DAILY = True     # Also roll it over when the day changes
+LOG_COMPRESSION = "gzip"  # Rolled logs: "gzip", "zstd" (needs zstandard) or None
+KEEP_LOGS = 30          # Rolled logs kept; older ones are deleted (None = keep all)
+SERIES_DIR = "ram_series"   # Every local RAM_DATA sample, see core/timeseries.py (None = off)
 
 class LoggerAgent(BaseAgent):
     def __init__(self, bus: MessageBus):
@@ -17,32 +28,53 @@ class LoggerAgent(BaseAgent):
         self.log_file = "ram_log.csv"
         self.latest_ram = 0
         self.latest_processes = []
-        self.bus.subscribe("RAM_HIGH", self.on_ram_high)
-        self.bus.subscribe("RAM_NORMAL", self.on_ram_normal)
-        self.bus.subscribe("SEND_EMAIL", self.on_email_sent)
-        self.bus.subscribe("RESTART", self.on_restart)
-        self.bus.subscribe("RAM_DATA", self.on_ram_data)
+        # Handlers only queue rows; one background thread writes the file
+        self.writer = CsvLogWriter(self.log_file, HEADER, flush_interval=FLUSH_INTERVAL,
+                                   fsync_interval=FSYNC_INTERVAL, max_bytes=MAX_LOG_BYTES,
+                                   daily=ROTATE_DAILY, compression=LOG_COMPRESSION, keep=KEEP_LOGS)
+        self.series = TimeSeriesStore(SERIES_DIR) if SERIES_DIR else None
+        # One catch-all subscription; events without a handler are ignored.
+        # Handlers match exact topics: "RAM_HIGH.host-3" is a simulated or
+        # remote host and must not show up in ram_log.csv as a local row
+        self.handlers = {
+            "RAM_HIGH": self.on_ram_high,
+            "RAM_NORMAL": self.on_ram_normal,
+            "SEND_EMAIL": self.on_email_sent,
+            "RESTART": self.on_restart,
+            "PROCESS_LEAK_SUSPECTED": self.on_leak_suspected,
+            "RAM_BREACH_PREDICTED": self.on_breach_predicted,
+        }
+        self.bus.subscribe("#", self.on_event)
+        # Its own subscription, since the catch-all one coalesces RAM_DATA
+        # whenever this lane lags and the time series needs every sample
+        self.bus.subscribe("RAM_DATA", self.on_ram_data, policy=KEEP_ALL)
 
     def run(self):
         print(f"[{self.name}] Ready. Logging to {self.log_file}")
-        self._setup_csv()
         threading.Thread(target=self._snapshot_loop, daemon=True).start()
+
+    async def run_async(self):
+        print(f"[{self.name}] Ready. Logging to {self.log_file}")
         while True:
-            time.sleep(1)
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            self._write_snapshot()
 
-    def _setup_csv(self):
-        if not os.path.isfile(self.log_file):
-            with open(self.log_file, mode="w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Timestamp", "Event", "RAM%", "Details", "Top Processes"])
+    def stop(self):
+        self.writer.close()
+        if self.series is not None:
+            self.series.close()
 
     def _write_log(self, event, ram, details, processes):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         process_str = ", ".join([f"{p['name']}({p['memory']}%)" for p in processes])
-        with open(self.log_file, mode="a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([timestamp, event, f"{ram}%", details, process_str])
-            print(f"[{self.name}] Logged: {event} | {ram}% | {details} | {process_str}")
+        self.writer.write([timestamp, event, f"{ram}%", details, process_str])
+        print(f"[{self.name}] Logged: {event} | {ram}% | {details} | {process_str}")
+
+    @nonblocking
+    def on_event(self, message):
+        handler = self.handlers.get(message.event_type)
+        if handler is not None:
+            handler(message)
 
     def on_ram_high(self, message):
         ram = message.payload["ram_percent"]
@@ -64,13 +96,35 @@ class LoggerAgent(BaseAgent):
         processes = message.payload["top_processes"]
         self._write_log("RESTART", ram, "System restart triggered", processes)
 
+    def on_leak_suspected(self, message):
+        leak = message.payload
+        details = (f"{leak.name} (PID {leak.pid}) at {leak.rss_mb} MB, "
+                   f"+{leak.growth_mb_per_min} MB/min over {leak.observed_seconds}s")
+        self._write_log("LEAK_SUSPECTED", self.latest_ram, details, [])
+
+    def on_breach_predicted(self, message):
+        forecast = message.payload
+        details = (f"{forecast.threshold}% expected in {forecast.seconds_to_breach:.0f}s "
+                   f"(+{forecast.trend_per_min}%/min)")
+        self._write_log("BREACH_PREDICTED", forecast.ram_percent, details, forecast.top_processes)
+
+    @nonblocking
     def on_ram_data(self, message):
-        self.latest_ram = message.payload["ram_percent"]
+        sample = message.payload
+        self.latest_ram = sample.ram_percent
+        self.latest_processes = sample.top_processes
+        if self.series is not None:
+            swap = sample.pressure.swap_percent if sample.pressure is not None else None
+            self.series.append(message.wall_time, sample.ram_percent, swap,
+                               [p["name"] for p in sample.top_processes])
 
     def _snapshot_loop(self):
         while True:
-            time.sleep(6 * 60 * 60)
-            self._write_log("SNAPSHOT", self.latest_ram, "Scheduled 6-hour report", self.latest_processes)
+            time.sleep(SNAPSHOT_INTERVAL)
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        self._write_log("SNAPSHOT", self.latest_ram, "Scheduled 6-hour report", self.latest_processes)
 
 
 # ============ STANDALONE TEST ============
@@ -78,5 +132,5 @@ if __name__ == "__main__":
     from core.message_bus import MessageBus
     bus = MessageBus()
     agent = LoggerAgent(bus)
-    threading.Thread(target=bus.start_routing, daemon=True).start()
-    agent.run()
\ No newline at end of file
+    agent.run()
+    bus.start_routing()
\ No newline at end of file
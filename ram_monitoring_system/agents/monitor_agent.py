@@ -1,83 +1,188 @@
 """
 Monitor Agent
 
-PERCEIVES: RAM usage every 10 seconds
+PERCEIVES: RAM usage, more often the closer it is to the threshold
 ACTS: Publishes RAM_DATA to the bus + updates taskbar icon
 """
 
-import psutil
+import asyncio
 import time
 import threading
 from datetime import datetime
-import pystray
 import os
-from PIL import Image, ImageDraw
+from collectors.grouping import ProcessGrouper
+from collectors.leak_detector import LeakDetector
+from collectors.pressure import PressureCollector
+from collectors.psutil_collector import PsutilCollector
+from collectors.sampler import HighResSampler
 from core.base_agent import BaseAgent
+from core.message import RamSample
 from core.message_bus import MessageBus
 
 
 # ============ CONFIGURATION ============
-CHECK_INTERVAL = 5
 RAM_THRESHOLD = 50
+# Sampling interval adapts to how close RAM is to the threshold: MAX_INTERVAL
+# when it is ADAPTIVE_RANGE points or more below, shrinking linearly to
+# MIN_INTERVAL at the threshold and above
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 10
+ADAPTIVE_RANGE = 20
+TOP_PROCESSES = 3       # Processes reported with every RAM_DATA
+SAMPLER_RATE = 20       # High-resolution RAM samples per second between ticks (0 = off)
+LEAK_DETECTION = True   # Track every process's RSS and publish PROCESS_LEAK_SUSPECTED
+PRESSURE_METRICS = True # Add PSI, swap and cgroup v2 readings to RAM_DATA (Linux)
+GROUP_BY = "name"       # Also report top groups: "name", "tree", "user", "cgroup" or None
+TOP_GROUPS = 3
+# Tray icon color bands, checked top down: (lowest RAM %, color)
+ICON_BANDS = (
+    (50, (255, 0, 0)),      # red - critical
+    (40, (255, 165, 0)),    # orange - warning
+    (30, (255, 255, 0)),    # yellow - moderate
+    (0, (0, 255, 0)),       # green - normal
+)
 
 class MonitorAgent(BaseAgent):
 
-    def __init__(self, bus: MessageBus):
+    def __init__(self, bus: MessageBus, collector=None, headless=False, group_by=GROUP_BY):
         super().__init__("MonitorAgent", bus)
+        # Headless never imports pystray/PIL, for servers without a desktop
+        self.headless = headless
         self.tray_icon = None
+        self.icons = []         # Pre-rendered image per ICON_BANDS entry
+        self.icon_band = None
         self.breach_start_time = None
+        # PsutilCollector, or ProcfsCollector for the Linux /proc fast path
+        self.collector = collector or PsutilCollector()
+        self.leak_detector = LeakDetector() if LEAK_DETECTION else None
+        self.grouper = ProcessGrouper(group_by) if group_by else None
+        self.pressure = None
+        if PRESSURE_METRICS and PressureCollector.supported():
+            self.pressure = PressureCollector()
+        self.sampler = None
+        if SAMPLER_RATE:
+            self.sampler = HighResSampler(
+                self.collector.ram_reader(),
+                rate=SAMPLER_RATE,
+                seconds=2 * MAX_INTERVAL
+            )
 
     def run(self):
+        self.print_banner()
+        if not self.headless:
+            self.setup_tray()
+        if self.sampler is not None:
+            self.sampler.start()
+
+        while True:
+            started = time.monotonic()
+            sample, leaks = self.sample()
+            self.report(sample, leaks)
+            time.sleep(max(0, self.next_interval(sample.peak) - (time.monotonic() - started)))
+
+    async def run_async(self):
+        self.print_banner()
+        if not self.headless:
+            self.setup_tray()
+        if self.sampler is not None:
+            self.sampler.start()
+
+        while True:
+            started = time.monotonic()
+            # Collectors walk /proc, so keep them off the event loop
+            sample, leaks = await self.run_blocking(self.sample)
+            self.report(sample, leaks)
+            await asyncio.sleep(max(0, self.next_interval(sample.peak) - (time.monotonic() - started)))
+
+    def print_banner(self):
         print("=" * 50)
         print("MONITOR AGENT STARTED")
-        print(f"Checking RAM every {CHECK_INTERVAL} seconds")
+        print(f"Checking RAM every {MIN_INTERVAL}-{MAX_INTERVAL} seconds")
         print(f"Threshold: {RAM_THRESHOLD}%")
+        print(f"Collector: {self.collector.name}")
+        if self.headless:
+            print("Headless: no tray icon")
+        if self.sampler is not None:
+            print(f"High-resolution sampling at {SAMPLER_RATE} Hz")
         print("=" * 50)
 
-        self.setup_tray()
+    def next_interval(self, ram):
+        headroom = (RAM_THRESHOLD - ram) / ADAPTIVE_RANGE
+        return MIN_INTERVAL + (MAX_INTERVAL - MIN_INTERVAL) * min(max(headroom, 0), 1)
 
-        while True:
-            ram = self.get_ram_percent()
-            processes = self.get_top_processes()
-
-            # Update taskbar icon
-            self.tray_icon.icon = self.create_icon_image(ram)
-            self.tray_icon.title = f"RAM: {ram}%"
-
-            # Print to terminal
-            self.print_status(ram, processes)
-
-            # Publish to bus so main.py receives it
-            self.publish("RAM_DATA", {
-                "ram_percent": ram,
-                "top_processes": processes
-            })
-            # process = psutil.Process(os.getpid())
-            # print(f"RAM used by this program: {process.memory_percent():.2f}%")
-            # print(f"CPU used by this program: {process.cpu_percent()}%")
-            time.sleep(CHECK_INTERVAL)
+    def sample(self):
+        """Read everything for one tick: (RamSample, new leak suspects)."""
+        # The top-process scan reads every RSS anyway; the leak detector and
+        # the grouper are fed in the same pass
+        observers = [o for o in (self.leak_detector, self.grouper) if o is not None]
+        now = time.monotonic()
+        for observer in observers:
+            observer.begin(now)
+        if len(observers) > 1:
+            def observe(pid, rss, started):
+                for observer in observers:
+                    observer.observe(pid, rss, started)
+        else:
+            observe = observers[0].observe if observers else None
+        processes = self.collector.get_top_processes(TOP_PROCESSES, observe)
+
+        leaks = []
+        if self.leak_detector is not None:
+            for pid, suspect in self.leak_detector.end():
+                suspect.name = self.collector.process_name(pid)
+                if suspect.name is not None:
+                    leaks.append(suspect)
+
+        sample = RamSample(self.get_ram_percent(), processes)
+        if self.grouper is not None:
+            self.grouper.end()
+            sample.top_groups = self.grouper.top(TOP_GROUPS)
+        if self.pressure is not None:
+            sample.pressure = self.pressure.read()
+        return sample, leaks
+
+    def report(self, sample, leaks=()):
+        ram = sample.ram_percent
+        window = self.sampler.drain() if self.sampler is not None else None
+        if window is not None:
+            # The tick's own reading belongs to the window too
+            sample.ram_min = round(min(window.min, ram), 1)
+            sample.ram_max = round(max(window.max, ram), 1)
+            sample.ram_mean = round(window.mean, 1)
+
+        if self.tray_icon is not None:
+            self.update_tray(ram)
+
+        # Print to terminal
+        self.print_status(sample)
+
+        # Publish to bus so main.py receives it
+        self.publish("RAM_DATA", sample)
+        for suspect in leaks:
+            print(f"⚠️  Possible leak: {suspect.name} (PID {suspect.pid}) at {suspect.rss_mb} MB, "
+                  f"growing {suspect.growth_mb_per_min} MB/min for {suspect.observed_seconds}s")
+            self.publish("PROCESS_LEAK_SUSPECTED", suspect)
+        # process = psutil.Process(os.getpid())
+        # print(f"RAM used by this program: {process.memory_percent():.2f}%")
+        # print(f"CPU used by this program: {process.cpu_percent()}%")
 
     def get_ram_percent(self):
-        return psutil.virtual_memory().percent
+        return self.collector.get_ram_percent()
 
     def get_top_processes(self):
-        processes = []
-        for proc in psutil.process_iter(['name', 'memory_percent']):
-            try:
-                processes.append({
-                    'name': proc.info['name'],
-                    'memory': round(proc.info['memory_percent'], 2)
-                })
-            except:
-                pass
-        processes.sort(key=lambda x: x['memory'], reverse=True)
-        return processes[:3]
-
-    def print_status(self, ram_percent, top_processes):
+        return self.collector.get_top_processes(TOP_PROCESSES)
+
+    def print_status(self, sample):
         timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"\n[{timestamp}] RAM: {ram_percent}%")
+        print(f"\n[{timestamp}] RAM: {sample.ram_percent}%", end="")
+        if sample.ram_max is not None:
+            print(f" (min {sample.ram_min}% / mean {sample.ram_mean}% / max {sample.ram_max}%)", end="")
+        print()
+        pressure = sample.pressure
+        if pressure is not None:
+            self.print_pressure(pressure)
 
-        if ram_percent >= RAM_THRESHOLD:
+        if sample.peak >= RAM_THRESHOLD:
             if self.breach_start_time is None:
                 self.breach_start_time = time.time()
                 print(f"⚠️  HIGH RAM! Started monitoring...")
@@ -92,32 +197,57 @@ class MonitorAgent(BaseAgent):
                 print("✓ RAM normal")
 
         print(f"Top processes: ", end="")
-        for i, proc in enumerate(top_processes):
+        for i, proc in enumerate(sample.top_processes):
             if i > 0:
                 print(", ", end="")
-            print(f"{proc['name']} ({proc['memory']}%)", end="")
+            print(f"{proc.name} ({proc.memory}%)", end="")
         print()
 
+        if sample.top_groups:
+            groups = ", ".join(f"{group.name} x{group.processes} ({group.memory}%)"
+                               for group in sample.top_groups)
+            print(f"Top groups by {self.grouper.mode}: {groups}")
+
+    def print_pressure(self, pressure):
+        parts = []
+        if pressure.psi_some_avg10 is not None:
+            parts.append(f"PSI some {pressure.psi_some_avg10}% full {pressure.psi_full_avg10}%")
+        if pressure.swap_in_per_sec is not None:
+            parts.append(f"swap in {pressure.swap_in_per_sec}/s out {pressure.swap_out_per_sec}/s")
+        if pressure.cgroup_percent is not None:
+            parts.append(f"cgroup {pressure.cgroup_percent}% of limit")
+        if parts:
+            print("Pressure: " + " | ".join(parts))
+
     # ============ TASKBAR ICON ============
-    def create_icon_image(self, ram_percent):
-        image = Image.new('RGB', (256, 256), color=(0, 0, 0))
-        draw = ImageDraw.Draw(image)
+    def band_for(self, ram_percent):
+        for band, (lowest, _) in enumerate(ICON_BANDS):
+            if ram_percent >= lowest:
+                return band
+        return len(ICON_BANDS) - 1
 
-        if ram_percent >= 50:
-            color = (255, 0, 0)  # red - critical
-        elif ram_percent >= 40:
-            color = (255, 165, 0)  # orange - warning
-        elif ram_percent >= 30:
-            color = (255, 255, 0)  # yellow - moderate
-        else:
-            color = (0, 255, 0)  # green - normal
+    def create_icon_image(self, color):
+        from PIL import Image, ImageDraw
 
+        image = Image.new('RGB', (256, 256), color=(0, 0, 0))
+        draw = ImageDraw.Draw(image)
         draw.ellipse((4, 4, 252, 252), fill=color)
         return image
 
+    def update_tray(self, ram_percent):
+        # The icon only changes when RAM moves into another color band
+        band = self.band_for(ram_percent)
+        if band != self.icon_band:
+            self.icon_band = band
+            self.tray_icon.icon = self.icons[band]
+        self.tray_icon.title = f"RAM: {ram_percent}%"
+
     def setup_tray(self):
-        image = self.create_icon_image(0)
-        self.tray_icon = pystray.Icon("RAM Monitor", image, "RAM: 0%")
+        import pystray
+
+        self.icons = [self.create_icon_image(color) for _, color in ICON_BANDS]
+        self.icon_band = self.band_for(0)
+        self.tray_icon = pystray.Icon("RAM Monitor", self.icons[self.icon_band], "RAM: 0%")
         threading.Thread(target=self.tray_icon.run, daemon=True).start()
 
 
@@ -7,7 +7,6 @@ ACTS: Restarts the system
 
 import os
 import time
-import threading
 from core.base_agent import BaseAgent
 from core.message_bus import MessageBus
 
@@ -20,8 +19,6 @@ class RestartAgent(BaseAgent):
 
     def run(self):
         print(f"[{self.name}] Ready. Waiting for events...")
-        while True:
-            time.sleep(1)
 
     def on_restart(self, message):
         ram = message.payload["ram_percent"]
@@ -0,0 +1,81 @@
+"""
+Simulator Agent
+
+PERCEIVES: Simulated sources (synthetic load or a recorded trace) per host
+ACTS: Publishes RAM_DATA.<host> to the bus at N x wall clock speed
+
+Stands in for MonitorAgent when load testing main.on_ram_data, the logger
+and the dashboard. Messages are stamped with simulated time, so escalation
+timers run at the simulated speed too.
+"""
+
+import heapq
+import time
+from core.base_agent import BaseAgent
+from core.message import Message
+from core.message_bus import MessageBus
+
+
+def _tagged(host, source):
+    for t, sample in source:
+        yield t, host, sample
+
+
+class SimulatorAgent(BaseAgent):
+
+    def __init__(self, bus: MessageBus, sources, speed=1.0, duration=None):
+        """
+        sources: {host name: source}
+        speed: simulated seconds per wall clock second; 0 = as fast as possible
+        duration: simulated seconds to run for; None = until the sources end
+        """
+        super().__init__("SimulatorAgent", bus)
+        self.sources = sources
+        self.speed = speed
+        self.duration = duration
+        self.published = 0
+        self.elapsed = 0.0
+
+    def run(self):
+        speed = f"{self.speed}x" if self.speed else "max speed"
+        print(f"[{self.name}] Simulating {len(self.sources)} host(s) at {speed}")
+        started = time.monotonic()
+        started_ns = time.monotonic_ns()
+
+        # All hosts' samples in simulated time order
+        stream = heapq.merge(
+            *(_tagged(host, source) for host, source in self.sources.items()),
+            key=lambda item: item[0]
+        )
+        for t, host, sample in stream:
+            if self.duration is not None and t > self.duration:
+                break
+            if self.speed:
+                delay = started + t / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.bus.publish(Message(
+                event_type=f"RAM_DATA.{host}",
+                payload=sample,
+                sender=self.name,
+                mono_ns=started_ns + int(t * 1_000_000_000)
+            ))
+            self.published += 1
+
+        self.elapsed = time.monotonic() - started
+        print(f"[{self.name}] Done: {self.published} samples in {self.elapsed:.1f}s "
+              f"({self.published / max(self.elapsed, 1e-9):,.0f}/s)")
+
+    async def run_async(self):
+        # Paced with sleeps; publish() is thread-safe on the async bus
+        await self.run_blocking(self.run)
+
+
+# ============ STANDALONE TEST ============
+if __name__ == "__main__":
+    from collectors.simulated import SyntheticSource
+    bus = MessageBus()
+    agent = SimulatorAgent(bus, {f"host-{i}": SyntheticSource(seed=i) for i in range(3)},
+                           speed=10, duration=60)
+    agent.start()
+    bus.start_routing()
@@ -0,0 +1,72 @@
+"""
+Bus Contention Benchmark
+
+Many threads look up subscribers for published events (the routing hot
+path) while another thread keeps subscribing and unsubscribing. Compares
+the copy-on-write snapshot against a table guarded by one lock, like the
+MessageBus before the change.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.bus_contention
+"""
+
+import threading
+import time
+from core.message_bus import MessageBus
+
+
+LOOKUPS = 200000        # Per publisher thread
+TOPICS = ["RAM_DATA", "RAM_HIGH", "RAM_NORMAL", "SEND_EMAIL", "RESTART"]
+
+
+class LockedRoutingBus(MessageBus):
+    """Takes the subscription lock on every lookup."""
+
+    def subscribers_for(self, event_type):
+        with self._lock:
+            return self._table.match(event_type)
+
+
+def noop(message):
+    pass
+
+
+def run(bus, publishers):
+    for topic in TOPICS:
+        bus.subscribe(topic, noop)
+    bus.subscribe("#", lambda message: None)
+
+    stop = threading.Event()
+
+    def churn():
+        def temporary(message):
+            pass
+        while not stop.is_set():
+            bus.subscribe("RAM_DATA", temporary)
+            bus.unsubscribe("RAM_DATA", temporary)
+            time.sleep(0.001)
+
+    def publisher():
+        for i in range(LOOKUPS):
+            bus.subscribers_for(TOPICS[i % len(TOPICS)])
+
+    churner = threading.Thread(target=churn, daemon=True)
+    churner.start()
+    threads = [threading.Thread(target=publisher) for _ in range(publishers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    churner.join()
+    return publishers * LOOKUPS / elapsed
+
+
+if __name__ == "__main__":
+    for publishers in (1, 4, 16):
+        locked = run(LockedRoutingBus(), publishers)
+        snapshot = run(MessageBus(), publishers)
+        print(f"{publishers:>2} publishers   locked {locked:>12,.0f} lookups/s"
+              f"   copy-on-write {snapshot:>12,.0f} lookups/s")
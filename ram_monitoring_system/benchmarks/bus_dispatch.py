@@ -0,0 +1,71 @@
+"""
+Bus Dispatch Benchmark
+
+Compares the worker-pool MessageBus against the old thread-per-callback
+routing: messages/sec and p99 latency from publish to handler start.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.bus_dispatch
+"""
+
+import threading
+import time
+from core.message import Message
+from core.message_bus import MessageBus, KEEP_ALL
+
+
+MESSAGES = 5000
+SUBSCRIBERS = 3     # RAM_DATA fans out to main, LoggerAgent and DashboardAgent
+
+
+class ThreadPerCallbackBus(MessageBus):
+    """The routing MessageBus used before the worker pool."""
+
+    def _route(self, message):
+        for _lane, callback, _policy, _stats in self.subscribers_for(message.event_type):
+            threading.Thread(target=callback, args=(message,), daemon=True).start()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(bus):
+    latencies = []
+    lock = threading.Lock()
+    done = threading.Event()
+    expected = MESSAGES * SUBSCRIBERS
+
+    def make_handler():
+        def handler(message):
+            latency = time.perf_counter() - message.payload["sent"]
+            with lock:
+                latencies.append(latency)
+                if len(latencies) == expected:
+                    done.set()
+        return handler
+
+    # KEEP_ALL so every message is delivered and timed (RAM_DATA coalesces by default)
+    for _ in range(SUBSCRIBERS):
+        bus.subscribe("RAM_DATA", make_handler(), policy=KEEP_ALL)
+    threading.Thread(target=bus.start_routing, daemon=True).start()
+
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        bus.publish(Message("RAM_DATA", {"sent": time.perf_counter()}, "bench"))
+    done.wait(timeout=120)
+    elapsed = time.perf_counter() - start
+    bus.stop()
+
+    return MESSAGES / elapsed, percentile(latencies, 99) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{MESSAGES} messages x {SUBSCRIBERS} subscribers")
+    for name, bus in [
+        ("thread-per-callback", ThreadPerCallbackBus()),
+        ("worker pool", MessageBus()),
+    ]:
+        rate, p99 = run(bus)
+        print(f"{name:<20} {rate:>10.0f} msg/s   p99 dispatch {p99:8.2f} ms")
@@ -0,0 +1,79 @@
+"""
+Bus Priority Benchmark
+
+Floods RAM_DATA through the bus and measures how long escalation events
+(SEND_EMAIL) take from publish to handler, with priority classes on and
+with every event forced into the same class (the old single FIFO).
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.bus_priority
+"""
+
+import threading
+import time
+from core.message import Message, NORMAL
+from core.message_bus import MessageBus, KEEP_ALL
+
+
+FLOOD = 20000           # RAM_DATA messages
+ESCALATIONS = 50        # SEND_EMAIL messages published during the flood
+TELEMETRY_SUBSCRIBERS = 3
+HANDLER_WORK = 0.00005  # Seconds of busy work per RAM_DATA callback
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run(use_priorities):
+    bus = MessageBus()
+    latencies = []
+    done = threading.Event()
+
+    def make_telemetry_handler():
+        def handler(message):
+            busy(HANDLER_WORK)
+        return handler
+
+    def on_escalation(message):
+        latencies.append(time.perf_counter() - message.payload["sent"])
+        if len(latencies) == ESCALATIONS:
+            done.set()
+
+    # KEEP_ALL so the flood really queues up instead of coalescing
+    for _ in range(TELEMETRY_SUBSCRIBERS):
+        bus.subscribe("RAM_DATA", make_telemetry_handler(), policy=KEEP_ALL)
+    bus.subscribe("SEND_EMAIL", on_escalation)
+    threading.Thread(target=bus.start_routing, daemon=True).start()
+
+    priority = None if use_priorities else NORMAL
+
+    def flood():
+        for i in range(FLOOD):
+            bus.publish(Message("RAM_DATA", {"ram_percent": 42}, "bench"), priority)
+
+    flooder = threading.Thread(target=flood, daemon=True)
+    flooder.start()
+    time.sleep(0.05)
+    for _ in range(ESCALATIONS):
+        bus.publish(Message("SEND_EMAIL", {"sent": time.perf_counter()}, "bench"), priority)
+        time.sleep(0.01)
+
+    done.wait(timeout=300)
+    flooder.join()
+    bus.stop()
+    return percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{FLOOD} RAM_DATA x {TELEMETRY_SUBSCRIBERS} subscribers, {ESCALATIONS} SEND_EMAIL")
+    for name, use_priorities in [("single FIFO", False), ("priority lanes", True)]:
+        p50, p99 = run(use_priorities)
+        print(f"{name:<16} escalation latency p50 {p50:9.2f} ms   p99 {p99:9.2f} ms")
@@ -0,0 +1,74 @@
+"""
+Escalation Engine Benchmark
+
+Evaluates main.ESCALATION_RULES for 100 to 10000 hosts whose RAM ramps
+through a breach and back, from one thread and from four threads at once.
+Reports the cost per sample (it should not grow with the number of hosts),
+the state kept per host, and checks every host escalated exactly once.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.escalation
+"""
+
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from core.escalation import EscalationEngine
+from core.message import MemoryPressure, RamSample
+from main import ESCALATION_RULES
+
+
+TICKS = 60              # Samples per host, 1s apart
+THREADS = 4
+
+
+def samples():
+    # 10s normal, 40s high, 10s normal again, with pressure readings
+    pressure = MemoryPressure(psi_some_avg10=0.5, swap_in_per_sec=0.0)
+    return [
+        RamSample(70.0 if 10 <= t < 50 else 30.0, [], pressure=pressure)
+        for t in range(TICKS)
+    ]
+
+
+def run(engine, hosts, threads):
+    series = samples()
+    fired = Counter()
+
+    def worker(offset):
+        counts = Counter()
+        for t, sample in enumerate(series):
+            for host in range(offset, hosts, threads):
+                for event, _ in engine.evaluate(host, sample, t):
+                    counts[event] += 1
+        fired.update(counts)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start, fired
+
+
+if __name__ == "__main__":
+    print(f"{'hosts':>6} {'threads':>8} {'us/sample':>10} {'samples/s':>11}  events")
+    for hosts in (100, 1000, 10000):
+        for threads in (1, THREADS):
+            engine = EscalationEngine(ESCALATION_RULES)
+            elapsed, fired = run(engine, hosts, threads)
+            assert all(fired[event] == hosts for event in engine.event_types()), fired
+            total = hosts * TICKS
+            print(f"{hosts:6} {threads:8} {elapsed / total * 1e6:10.2f} {total / elapsed:11,.0f}  "
+                  f"{sum(fired.values())} (each host once per event)")
+
+    tracemalloc.start()
+    engine = EscalationEngine(ESCALATION_RULES)
+    sample = samples()[0]
+    for host in range(10000):
+        engine.evaluate(f"host-{host}", sample, 0)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\nstate      {size / 10000:.0f} bytes per host, including its name and slot")
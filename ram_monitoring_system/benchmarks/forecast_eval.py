@@ -0,0 +1,100 @@
+"""
+Breach Forecast Evaluation
+
+Replays traces through the BreachForecaster offline and scores its
+RAM_BREACH_PREDICTED events against the breaches that actually followed:
+    lead time       seconds between a forecast and the breach it predicted
+    false positive  a forecast with no breach within the horizon (+ slack)
+    missed          a breach with no forecast before it
+A breach starts when the forecaster's input reaches the threshold and ends
+below RAM_CLEAR, like in the escalation rule. Without arguments it scores
+synthetic hosts (ramps through the threshold plus noise); pass recorded
+traces (ram_log.csv or --journal files) to score those instead.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.forecast_eval [TRACE ...]
+"""
+
+import statistics
+import sys
+import time
+from collectors.simulated import SyntheticSource, TraceSource
+from core.forecast import BreachForecaster, HORIZON
+from main import RAM_CLEAR, RAM_THRESHOLD
+
+
+HOSTS = 200
+DURATION = 4 * 60 * 60      # Simulated seconds per synthetic host
+SLACK = 30                  # Seconds a breach may come later than the horizon
+
+
+def score(series):
+    """(lead times, false positives, missed breaches, breaches, forecasts) of one host."""
+    forecaster = BreachForecaster(RAM_THRESHOLD)
+    forecasts = []          # (time, predicted seconds to breach)
+    breaches = []
+    breached = False
+    for t, sample in series:
+        value = sample.ram_percent if sample.ram_mean is None else sample.ram_mean
+        if not breached and value >= RAM_THRESHOLD:
+            breached = True
+            breaches.append(t)
+        elif breached and value < RAM_CLEAR:
+            breached = False
+        forecast = forecaster.update("host", sample, t)
+        if forecast is not None:
+            forecasts.append((t, forecast.seconds_to_breach))
+
+    leads, errors, false_positives = [], [], 0
+    for t, predicted in forecasts:
+        following = [b for b in breaches if t < b <= t + HORIZON + SLACK]
+        if following:
+            leads.append(following[0] - t)
+            errors.append(predicted - (following[0] - t))
+        else:
+            false_positives += 1
+    missed = sum(
+        1 for b in breaches
+        if not any(b - HORIZON - SLACK <= t < b for t, _ in forecasts)
+    )
+    return leads, errors, false_positives, missed, len(breaches), len(forecasts)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        traces = {path: TraceSource(path) for path in sys.argv[1:]}
+    else:
+        traces = {f"host-{i}": SyntheticSource(seed=i, duration=DURATION) for i in range(HOSTS)}
+
+    leads, errors = [], []
+    false_positives = missed = breaches = forecasts = samples = 0
+    start = time.perf_counter()
+    for source in traces.values():
+        series = list(source)
+        samples += len(series)
+        result = score(series)
+        leads += result[0]
+        errors += result[1]
+        false_positives += result[2]
+        missed += result[3]
+        breaches += result[4]
+        forecasts += result[5]
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(traces)} trace(s), {samples} samples, threshold {RAM_THRESHOLD}%, horizon {HORIZON}s")
+    print(f"breaches        {breaches}")
+    print(f"forecasts       {forecasts}")
+    print(f"predicted       {breaches - missed} of {breaches} breaches "
+          f"({(breaches - missed) / max(breaches, 1):.0%})")
+    print(f"false positives {false_positives} ({false_positives / max(forecasts, 1):.0%} of forecasts)")
+    if leads:
+        print(f"lead time       median {statistics.median(leads):.0f}s, "
+              f"p10 {percentile(leads, 10):.0f}s, p90 {percentile(leads, 90):.0f}s")
+        print(f"eta error       median {statistics.median(errors):+.0f}s "
+              f"(predicted minus actual seconds to breach)")
+    print(f"cost            {elapsed / max(samples, 1) * 1e6:.1f} us per sample, scoring included")
@@ -0,0 +1,69 @@
+"""
+Journal Write Benchmark
+
+Appends messages to a Journal from several publisher threads and reports
+sustained messages/sec until everything is written and fsynced, plus the
+replay speed of the resulting file.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.journal_write
+"""
+
+import os
+import tempfile
+import threading
+import time
+from core.journal import Journal
+from core.message import Message
+
+
+MESSAGES = 100000       # Per publisher thread
+PUBLISHERS = 4
+
+
+def sample_payload(i):
+    return {
+        "ram_percent": 40 + i % 20,
+        "top_processes": [
+            {"name": "chrome", "memory": 6.22},
+            {"name": "python", "memory": 2.17},
+            {"name": "code", "memory": 1.05},
+        ],
+    }
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_journal.bin")
+        journal = Journal(path)
+        messages = [Message("RAM_DATA", sample_payload(i), "bench") for i in range(MESSAGES)]
+
+        def publisher():
+            for message in messages:
+                journal.append(message)
+
+        threads = [threading.Thread(target=publisher) for _ in range(PUBLISHERS)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        journal.close()
+        elapsed = time.perf_counter() - start
+
+        total = MESSAGES * PUBLISHERS
+        size = sum(os.path.getsize(p) for p in journal.segments())
+        print(f"write   {total / elapsed:>10,.0f} msg/s   ({total:,} messages, "
+              f"{size / total:.0f} bytes/message, fsynced)")
+
+        journal = Journal(path)
+        start = time.perf_counter()
+        replayed = sum(1 for _ in journal.replay())
+        elapsed = time.perf_counter() - start
+        print(f"replay  {replayed / elapsed:>10,.0f} msg/s")
+
+        start = time.perf_counter()
+        sum(1 for _ in journal.replay({"RAM_HIGH", "RAM_NORMAL", "SEND_EMAIL", "RESTART"}))
+        elapsed = time.perf_counter() - start
+        print(f"scan    {total / elapsed:>10,.0f} msg/s   (escalation events only)")
+        journal.close()
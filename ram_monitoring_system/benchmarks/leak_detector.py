@@ -0,0 +1,65 @@
+"""
+Leak Detector Benchmark
+
+Feeds the LeakDetector synthetic RSS for thousands of PIDs (mostly steady
+with noise and occasional jumps, a few growing slowly) over simulated
+monitor ticks. Reports the cost per observed sample, memory per tracked
+PID, and which PIDs were flagged after how long.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.leak_detector
+"""
+
+import random
+import time
+import tracemalloc
+from collectors.leak_detector import LeakDetector, MB
+
+
+PIDS = 5000
+LEAKING = {17: 2.0, 1234: 1.5, 4321: 5.0}    # pid -> MB per minute
+TICK = 5            # Seconds between simulated monitor ticks
+DURATION = 1800     # Simulated seconds
+
+
+def rss_at(pid, t, rng):
+    base = (50 + pid % 400) * MB
+    noise = rng.gauss(0, 2) * MB
+    if pid in LEAKING:
+        return base + LEAKING[pid] * MB * t / 60 + noise
+    # Steady services: noise plus an occasional one-off jump (a cache warming)
+    jump = 40 * MB if pid % 97 == 0 and t > 600 else 0
+    return base + noise + jump
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    detector = LeakDetector()
+    flagged = {}
+    observe_time = 0.0
+    observed = 0
+
+    tracemalloc.start()
+    for t in range(0, DURATION + 1, TICK):
+        samples = [(pid, rss_at(pid, t, rng)) for pid in range(1, PIDS + 1)]
+        start = time.perf_counter()
+        detector.begin(t)
+        for pid, rss in samples:
+            detector.observe(pid, rss, 0)
+        for pid, suspect in detector.end():
+            flagged.setdefault(pid, (t, suspect))
+        observe_time += time.perf_counter() - start
+        observed += len(samples)
+        del samples
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{PIDS} PIDs, one sample every {TICK}s for {DURATION}s")
+    print(f"cost       {observe_time / observed * 1e6:6.2f} us per sample "
+          f"({observe_time / (observed / PIDS) * 1000:.1f} ms per tick)")
+    print(f"memory     {size / len(detector):6.0f} bytes per tracked PID")
+    for pid, (t, suspect) in sorted(flagged.items()):
+        kind = "leaking" if pid in LEAKING else "steady"
+        print(f"flagged    PID {pid:<5} ({kind}) after {t}s at {suspect.growth_mb_per_min} MB/min")
+    missed = set(LEAKING) - set(flagged)
+    print(f"missed     {sorted(missed) or 'none'}")
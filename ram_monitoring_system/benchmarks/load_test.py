@@ -0,0 +1,79 @@
+"""
+Load Test
+
+Pushes synthetic samples for many simulated hosts through the real
+pipeline as fast as it will take them: SimulatorAgent -> MessageBus ->
+main.on_ram_data, LoggerAgent (writing to a temporary folder) and
+DashboardAgent (without starting Flask). Reports publish throughput, how
+many samples each subscriber handled, and how many it shed under
+backpressure.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.load_test [HOSTS] [SIMULATED_SECONDS]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import main
+from collectors.simulated import SyntheticSource
+from core.message_bus import MessageBus
+from agents.dashboard_agent import DashboardAgent
+from agents.logger_agent import LoggerAgent
+from agents.simulator_agent import SimulatorAgent
+
+
+HOSTS = 1000
+DURATION = 600      # Simulated seconds; synthetic hosts sample every 5s
+
+
+def drained(bus):
+    return not bus.queue_depth() and not any(
+        lane["depth"] or lane["active"] for lane in bus.lane_stats()
+    )
+
+
+if __name__ == "__main__":
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else HOSTS
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    os.chdir(tempfile.mkdtemp())
+
+    bus = MessageBus()
+    main.bus = bus
+    bus.subscribe("RAM_DATA.#", main.on_ram_data)
+    dashboard = DashboardAgent(bus)
+    logger = LoggerAgent(bus)
+    sources = {f"host-{i}": SyntheticSource(seed=i) for i in range(hosts)}
+    simulator = SimulatorAgent(bus, sources, speed=0, duration=duration)
+    threading.Thread(target=bus.start_routing, daemon=True).start()
+
+    # The agents log every escalation; keep the console for the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        simulator.run()
+        published_in = time.perf_counter() - start
+        while not drained(bus):
+            time.sleep(0.01)
+        logger.writer.flush()
+        drained_in = time.perf_counter() - start
+    bus.stop()
+
+    metrics = bus.metrics_snapshot()
+    published = simulator.published
+    print(f"{hosts} hosts, {duration:.0f} simulated seconds, {published} samples")
+    print(f"publish    {published / published_in:10,.0f} samples/s ({published_in:.2f}s)")
+    print(f"drained    {drained_in:10.2f}s after the first sample")
+    print(f"routing    p50 {metrics['events']['RAM_DATA']['queue_wait']['p50_ms']} ms, "
+          f"p99 {metrics['events']['RAM_DATA']['queue_wait']['p99_ms']} ms")
+    print()
+    # A lagging lane coalesces each host's RAM_DATA down to its newest sample
+    print(f"{'subscriber':16} {'handled':>9} {'handled/s':>10} {'dropped':>9} {'coalesced':>10}")
+    for lane in metrics["lanes"]:
+        print(f"{lane['subscriber']:16} {lane['delivered']:9} {lane['delivered'] / drained_in:10,.0f} "
+              f"{lane['dropped']:9} {lane['coalesced']:10}")
+    print()
+    print(f"dashboard  {len(dashboard.hosts)} hosts tracked")
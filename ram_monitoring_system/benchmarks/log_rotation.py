@@ -0,0 +1,105 @@
+"""
+Log Rotation Benchmark
+
+Four publishers log rows through CsvLogWriter with a small max_bytes, so
+the log rolls over every megabyte while rolled segments are gzipped in the
+background. Compares sustained rows/sec with rotation off, reports how long
+the writer thread was held up by roll-overs (a rename and an open) against
+the time spent compressing on the other thread, the compression ratio, and
+then streams every row back across the compressed segments with
+read_rows(), checking none is missing and how much memory that takes.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.log_rotation
+"""
+
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from core import log_segments, log_writer
+from core.log_writer import CsvLogWriter
+
+
+ROWS = 50000            # Per publisher thread
+PUBLISHERS = 4
+MAX_BYTES = 1024 * 1024
+KEEP = 1000
+HEADER = ["Timestamp", "Event", "RAM%", "Details", "Top Processes"]
+
+
+def row(publisher, i):
+    return ["2024-01-01 10:00:00", "RAM_DATA", f"{40 + i % 20}%", f"publisher {publisher} row {i}",
+            "pycharm64.exe(6.22%), MemCompression(2.17%), chrome.exe(1.05%)"]
+
+
+class TimedWriter(CsvLogWriter):
+    roll_time = 0.0
+
+    def _roll_over(self):
+        start = time.perf_counter()
+        super()._roll_over()
+        self.roll_time += time.perf_counter() - start
+
+
+class TimedCompressor(log_segments.Compressor):
+    compress_time = 0.0
+
+    def _compress(self, segment):
+        start = time.perf_counter()
+        super()._compress(segment)
+        self.compress_time += time.perf_counter() - start
+
+
+def run(path, **options):
+    writer = TimedWriter(path, HEADER, **options)
+
+    def publisher(n):
+        for i in range(ROWS):
+            writer.write(row(n, i))
+
+    threads = [threading.Thread(target=publisher, args=(n,)) for n in range(PUBLISHERS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    if writer._compressor is not None:
+        writer._compressor.wait()
+    writer.close()
+    return writer, elapsed
+
+
+if __name__ == "__main__":
+    log_writer.Compressor = TimedCompressor
+
+    total = ROWS * PUBLISHERS
+    with tempfile.TemporaryDirectory() as tmp:
+        _, plain = run(os.path.join(tmp, "plain.csv"))
+        path = os.path.join(tmp, "ram_log.csv")
+        writer, rotating = run(path, max_bytes=MAX_BYTES, compression="gzip", keep=KEEP)
+
+        rolled = log_segments.segments(path)
+        compressed = sum(os.path.getsize(s) for s in rolled)
+        raw = os.path.getsize(os.path.join(tmp, "plain.csv"))
+        print(f"{PUBLISHERS} publishers x {ROWS} rows, roll over every {MAX_BYTES // 1024} KB")
+        print(f"no rotation     {total / plain:10,.0f} rows/s")
+        print(f"rotation + gzip {total / rotating:10,.0f} rows/s, {writer.rolled} roll-overs")
+        print(f"writer thread   {writer.roll_time / writer.rolled * 1000:.2f} ms per roll-over "
+              f"({writer.roll_time * 1000:.0f} ms total)")
+        print(f"compressor      {writer._compressor.compress_time / writer.rolled * 1000:.1f} ms "
+              f"per segment, off the write path")
+        print(f"size            {raw / 1e6:.1f} MB -> {compressed / 1e6:.1f} MB on disk "
+              f"({raw / max(compressed, 1):.1f}x)")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = sum(1 for _ in log_segments.read_rows(path))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"read_rows       {rows} of {total} rows from {len(rolled)} segments + live file, "
+              f"{rows / elapsed:,.0f} rows/s, peak {peak / 1e6:.1f} MB")
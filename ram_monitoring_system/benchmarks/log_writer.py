@@ -0,0 +1,96 @@
+"""
+Log Writer Benchmark
+
+Several publisher threads log rows at once, the way bus workers call
+LoggerAgent. Compares opening, writing and closing ram_log.csv for every
+row (LoggerAgent before the change) with the CsvLogWriter queue and its
+single writer thread, with and without fsync. Reports sustained rows/sec
+until everything is on disk and checks no row came out interleaved.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.log_writer
+"""
+
+import csv
+import os
+import tempfile
+import threading
+import time
+from core.log_writer import CsvLogWriter
+
+
+ROWS = 20000            # Per publisher thread
+PUBLISHERS = 4
+HEADER = ["Timestamp", "Event", "RAM%", "Details", "Top Processes"]
+
+
+def row(publisher, i):
+    return ["2024-01-01 10:00:00", "RAM_DATA", f"{40 + i % 20}%", f"publisher {publisher} row {i}",
+            "pycharm64.exe(6.22%), MemCompression(2.17%), chrome.exe(1.05%)"]
+
+
+def open_per_row(path):
+    # LoggerAgent._write_log before the change
+    def write(values):
+        with open(path, mode="a", newline="") as f:
+            csv.writer(f).writerow(values)
+    return write, lambda: None
+
+
+def run(path, make_writer):
+    write, finish = make_writer(path)
+
+    def publisher(n):
+        for i in range(ROWS):
+            write(row(n, i))
+
+    threads = [threading.Thread(target=publisher, args=(n,)) for n in range(PUBLISHERS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    finish()
+    return time.perf_counter() - start
+
+
+def check(path):
+    # Every row intact and every publisher's rows complete and in order
+    seen = [0] * PUBLISHERS
+    bad = 0
+    with open(path, newline="") as f:
+        for values in csv.reader(f):
+            if values == HEADER:
+                continue
+            try:
+                _, n, _, i = values[3].split()
+                if len(values) != len(HEADER) or int(i) != seen[int(n)]:
+                    raise ValueError
+                seen[int(n)] += 1
+            except (ValueError, IndexError):
+                bad += 1
+    return sum(seen), bad
+
+
+def buffered(fsync_interval):
+    def make_writer(path):
+        writer = CsvLogWriter(path, HEADER, fsync_interval=fsync_interval)
+        return writer.write, writer.close
+    return make_writer
+
+
+if __name__ == "__main__":
+    total = ROWS * PUBLISHERS
+    print(f"{PUBLISHERS} publishers x {ROWS} rows")
+    print(f"{'writer':34} {'rows/s':>10} {'intact':>8} {'bad':>5}")
+    variants = [
+        ("open/write/close per row", open_per_row),
+        ("CsvLogWriter, no fsync", buffered(None)),
+        ("CsvLogWriter, fsync every batch", buffered(0)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_writer in variants:
+            path = os.path.join(tmp, f"{len(os.listdir(tmp))}.csv")
+            elapsed = run(path, make_writer)
+            intact, bad = check(path)
+            print(f"{name:34} {total / elapsed:10,.0f} {intact:8} {bad:5}")
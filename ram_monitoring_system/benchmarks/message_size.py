@@ -0,0 +1,65 @@
+"""
+Message Size Benchmark
+
+Compares the old Message (regular dataclass, datetime.now() timestamp,
+dict payload of dicts) with the slotted Message and typed RAM_DATA
+records: construction cost per tick (best of REPEATS runs, since a
+single run is noisy at this scale) and memory per retained message.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.message_size
+"""
+
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from core.message import Message, ProcessEntry, RamSample
+
+
+MESSAGES = 100000
+REPEATS = 5
+TOP = [("chrome", 6.22), ("python", 2.17), ("code", 1.05)]
+
+
+@dataclass
+class LegacyMessage:
+    event_type: str
+    payload: dict
+    sender: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+def legacy_tick(ram):
+    return LegacyMessage("RAM_DATA", {
+        "ram_percent": ram,
+        "top_processes": [{"name": name, "memory": memory} for name, memory in TOP],
+    }, "MonitorAgent")
+
+
+def slotted_tick(ram):
+    return Message("RAM_DATA", RamSample(
+        ram, [ProcessEntry(name, memory) for name, memory in TOP]
+    ), "MonitorAgent")
+
+
+def measure(make):
+    per_tick = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            make(40.0 + i % 20)
+        per_tick = min(per_tick, (time.perf_counter() - start) / MESSAGES)
+
+    tracemalloc.start()
+    retained = [make(40.0 + i % 20) for i in range(MESSAGES)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return per_tick * 1e6, size / MESSAGES
+
+
+if __name__ == "__main__":
+    for name, make in [("dict + datetime", legacy_tick), ("slotted + typed", slotted_tick)]:
+        us, size = measure(make)
+        print(f"{name:<16} {us:6.2f} us/tick   {size:6.0f} bytes/retained message")
@@ -0,0 +1,89 @@
+"""
+Process Grouping Benchmark
+
+Spawns a few "applications" made of many small processes, then measures
+the extra cost per tick of grouping in each mode and checks that the
+incrementally maintained group totals match a full recount.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.process_groups            # 1000 processes
+    python -m benchmarks.process_groups 3000
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collectors.grouping import MODES, ProcessGrouper
+from collectors.procfs import ProcfsCollector
+
+
+TICKS = 20
+TOP = 3
+
+
+APP = """
+import os, signal
+for _ in range({children}):
+    if os.fork() == 0:
+        break
+signal.pause()
+"""
+
+
+def spawn(count):
+    # Four "applications", each a parent that forks a pile of children, in
+    # their own sessions so they can be killed as a whole
+    apps = [
+        # Started through sh so the parents are not our children: tree mode
+        # would otherwise group them all under this (also python) process
+        subprocess.Popen(["sh", "-c", '"$0" -c "$1"; :', sys.executable, APP.format(children=count // 4 - 1)],
+                         start_new_session=True)
+        for _ in range(4)
+    ]
+    time.sleep(2)
+    return apps
+
+
+def tick(collector, grouper):
+    if grouper is None:
+        return collector.get_top_processes(TOP)
+    grouper.begin()
+    processes = collector.get_top_processes(TOP, grouper.observe)
+    grouper.end()
+    grouper.top(TOP)
+    return processes
+
+
+def cpu_per_tick(collector, grouper):
+    tick(collector, grouper)    # Warm up: every PID joins its group
+    cpu = time.process_time()
+    for _ in range(TICKS):
+        tick(collector, grouper)
+    return (time.process_time() - cpu) / TICKS
+
+
+def recount(grouper):
+    totals = defaultdict(int)
+    for member in grouper._members.values():
+        totals[member.group.label] += member.rss
+    return all(group.rss == totals[group.label] for group in grouper._groups.values())
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    apps = spawn(count)
+    try:
+        collector = ProcfsCollector()
+        print(f"no grouping    {cpu_per_tick(collector, None) * 1000:7.2f} ms CPU/tick")
+        for mode in MODES:
+            grouper = ProcessGrouper(mode)
+            cpu = cpu_per_tick(collector, grouper)
+            top = ", ".join(f"{g.name} x{g.processes}" for g in grouper.top(TOP))
+            print(f"by {mode:<11} {cpu * 1000:7.2f} ms CPU/tick   totals ok: {recount(grouper)}   {top}")
+    finally:
+        for app in apps:
+            os.killpg(app.pid, signal.SIGTERM)
+            app.wait()
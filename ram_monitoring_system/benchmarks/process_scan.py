@@ -0,0 +1,71 @@
+"""
+Process Scan Benchmark
+
+Spawns idle child processes and measures the cost of one MonitorAgent tick
+picking the top 3 processes by memory: the old full rescan
+(psutil.process_iter + full sort) against the incremental ProcessTable.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.process_scan            # 1000 and 10000 processes
+    python -m benchmarks.process_scan 500 2000
+"""
+
+import subprocess
+import sys
+import time
+import psutil
+from collectors.process_table import ProcessTable
+from core.message import ProcessEntry
+
+
+TICKS = 5
+TOP = 3
+
+
+def full_rescan():
+    processes = []
+    for proc in psutil.process_iter(['name', 'memory_percent']):
+        try:
+            processes.append(ProcessEntry(
+                proc.info['name'],
+                round(proc.info['memory_percent'], 2)
+            ))
+        except Exception:
+            pass
+    processes.sort(key=lambda x: x.memory, reverse=True)
+    return processes[:TOP]
+
+
+def spawn(count, children):
+    while len(children) < count:
+        children.append(subprocess.Popen(["sleep", "3600"]))
+
+
+def per_tick(tick):
+    tick()      # Warm up (fills the ProcessTable)
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        tick()
+    return (time.perf_counter() - start) / TICKS, (time.process_time() - cpu) / TICKS
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    children = []
+    try:
+        for count in counts:
+            try:
+                spawn(count, children)
+            except OSError as e:
+                print(f"Stopped spawning at {len(children)} processes: {e}")
+            print(f"{len(psutil.pids())} processes")
+            table = ProcessTable()
+            for name, tick in [("full rescan", full_rescan), ("process table", lambda: table.top(TOP))]:
+                wall, cpu = per_tick(tick)
+                print(f"  {name:<14} {wall * 1000:8.1f} ms/tick   {cpu * 1000:8.1f} ms CPU/tick")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
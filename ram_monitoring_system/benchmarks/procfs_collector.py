@@ -0,0 +1,74 @@
+"""
+procfs Collector Benchmark
+
+Checks that ProcfsCollector returns the same RAM percentage and top
+processes as PsutilCollector, then compares their CPU cost per tick with
+idle child processes running.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.procfs_collector            # 1000 processes
+    python -m benchmarks.procfs_collector 5000
+"""
+
+import sys
+import time
+from benchmarks.process_scan import spawn
+from collectors.procfs import ProcfsCollector
+from collectors.psutil_collector import PsutilCollector
+
+
+TICKS = 20
+TOP = 3
+
+
+def tick(collector):
+    return collector.get_ram_percent(), collector.get_top_processes(TOP)
+
+
+def cpu_per_tick(collector):
+    tick(collector)     # Warm up (fills the psutil process table)
+    cpu = time.process_time()
+    for _ in range(TICKS):
+        tick(collector)
+    return (time.process_time() - cpu) / TICKS
+
+
+def compare(psutil_collector, procfs_collector):
+    # Memory moves between the two reads, so compare a few times and report
+    # the closest pair
+    best = None
+    for _ in range(5):
+        ram_a, top_a = tick(psutil_collector)
+        ram_b, top_b = tick(procfs_collector)
+        diff = abs(ram_a - ram_b)
+        same_top = top_a == top_b
+        if best is None or (same_top, -diff) > (best[0], -best[1]):
+            best = (same_top, diff, top_a, top_b)
+    return best
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    if not ProcfsCollector.supported():
+        sys.exit("/proc not available")
+
+    children = []
+    try:
+        spawn(count, children)
+        psutil_collector = PsutilCollector()
+        procfs_collector = ProcfsCollector()
+
+        same_top, diff, top_a, top_b = compare(psutil_collector, procfs_collector)
+        print(f"RAM % difference: {diff:.1f}")
+        print(f"Top {TOP} identical: {same_top}")
+        if not same_top:
+            print(f"  psutil: {top_a}\n  procfs: {top_b}")
+
+        for collector in (psutil_collector, procfs_collector):
+            print(f"{collector.name:<8} {cpu_per_tick(collector) * 1000:7.2f} ms CPU/tick "
+                  f"({count} extra processes)")
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
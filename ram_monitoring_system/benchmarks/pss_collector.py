@@ -0,0 +1,77 @@
+"""
+PSS Collector Benchmark
+
+Forks workers that share one large buffer (like a pre-fork server) plus one
+process with a smaller private buffer, then compares the top processes
+ranked by RSS with the ranking by PSS, and the cost of a tick.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.pss_collector
+"""
+
+import os
+import signal
+import time
+from collectors.procfs import ProcfsCollector
+from collectors.smaps import PssCollector
+
+
+SHARED_MB = 200
+WORKERS = 4
+PRIVATE_MB = 120
+TOP = 3
+TICKS = 10
+
+_hold = []      # A forked child's private buffer
+
+
+def fork(role, roles, allocate_mb=0):
+    pid = os.fork()
+    if pid == 0:
+        # Private memory kept alive until the benchmark kills the child
+        _hold.append(b"p" * (allocate_mb * 2 ** 20))
+        signal.pause()
+        os._exit(0)
+    roles[pid] = role
+
+
+def show(title, processes, roles):
+    print(title)
+    for proc in processes:
+        extra = f"  uss {proc.uss}%" if proc.uss is not None else ""
+        print(f"  {roles.get(proc.pid, proc.name):<22} {proc.memory:6.2f}%{extra}")
+
+
+def cpu_per_tick(collector):
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        collector.get_top_processes(TOP)
+    return (time.perf_counter() - start) / TICKS, (time.process_time() - cpu) / TICKS
+
+
+if __name__ == "__main__":
+    if not PssCollector.supported():
+        raise SystemExit("smaps_rollup not available")
+
+    shared = b"s" * (SHARED_MB * 2 ** 20)
+    roles = {os.getpid(): "benchmark (shared)"}
+    try:
+        for i in range(WORKERS):
+            fork(f"worker {i} (shared)", roles)
+        fork(f"hog ({PRIVATE_MB} MB private)", roles, PRIVATE_MB)
+        time.sleep(1)
+
+        rss = ProcfsCollector()
+        pss = PssCollector(ProcfsCollector())
+        show("Top by RSS:", rss.get_top_processes(TOP), roles)
+        show("Top by PSS:", pss.get_top_processes(TOP), roles)
+        for name, collector in (("rss", rss), ("pss", pss)):
+            wall, cpu = cpu_per_tick(collector)
+            print(f"{name:<4} {wall * 1000:6.2f} ms/tick  {cpu * 1000:6.2f} ms CPU/tick")
+        pss.close()
+    finally:
+        for pid in roles:
+            if pid != os.getpid():
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
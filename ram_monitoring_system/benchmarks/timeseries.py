@@ -0,0 +1,87 @@
+"""
+Time Series Store Benchmark
+
+Appends a month of 1 s RAM samples (about 2.6 million, with swap and the
+top 3 processes) to a TimeSeriesStore the way LoggerAgent.on_ram_data
+does, then reports the cost per append, the size on disk against the same
+samples as ram_log.csv rows, how long reopening the store takes, and the
+latency of time-range lookups from one minute to the whole month, alone and
+with a scan of the RAM column (the peak over the range).
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.timeseries
+"""
+
+import os
+import random
+import tempfile
+import time
+from core.timeseries import TimeSeriesStore
+
+DAYS = 30
+SAMPLES = DAYS * 24 * 60 * 60
+START = 1704067200.0    # 2024-01-01
+PROCESSES = ["pycharm64.exe", "MemCompression", "chrome.exe", "python.exe", "Code.exe",
+             "firefox.exe", "Teams.exe", "explorer.exe", "java.exe", "node.exe"]
+RANGES = [("1 min", 60), ("1 hour", 3600), ("1 day", 86400), ("1 week", 7 * 86400),
+          ("30 days", DAYS * 86400)]
+LOOKUPS = 200
+
+
+def csv_row_bytes(ram, swap, top):
+    # The same sample as a ram_log.csv row, for comparison
+    process_str = ", ".join(f"{name}(6.22%)" for name in top)
+    return len(f"2024-01-01 10:00:00,RAM_DATA,{ram}%,swap {swap}%,\"{process_str}\"\r\n")
+
+
+def fill(store):
+    rng = random.Random(1)
+    ram = 50.0
+    csv_bytes = 0
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        ram = min(max(ram + rng.gauss(0, 0.3), 5.0), 99.0)
+        swap = round(ram / 10, 1)
+        top = rng.sample(PROCESSES, 3)
+        store.append(START + i, round(ram, 1), swap, top)
+        if i % 1000 == 0:
+            csv_bytes += csv_row_bytes(round(ram, 1), swap, top) * 1000
+    store.flush()
+    return time.perf_counter() - start, csv_bytes
+
+
+def lookup(store, seconds, scan):
+    rng = random.Random(2)
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        begin = START + rng.randrange(0, max(SAMPLES - seconds, 1))
+        window = store.range(begin, begin + seconds)
+        if scan:
+            max(window.ram)
+    return (time.perf_counter() - start) / LOOKUPS
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "ram_series")
+        store = TimeSeriesStore(directory)
+        elapsed, csv_bytes = fill(store)
+        store.close()
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{SAMPLES:,} samples ({DAYS} days at 1 s)")
+        print(f"append          {elapsed / SAMPLES * 1e6:.2f} µs per sample")
+        print(f"on disk         {size / 1e6:.1f} MB, {size / SAMPLES:.0f} B per sample "
+              f"(as ram_log.csv rows: {csv_bytes / 1e6:.0f} MB)")
+
+        start = time.perf_counter()
+        store = TimeSeriesStore(directory)
+        window = store.range()
+        print(f"reopen + map    {(time.perf_counter() - start) * 1000:.1f} ms, {len(window):,} samples")
+
+        print(f"{'range':10} {'samples':>10} {'lookup':>10} {'lookup + peak':>14}")
+        for name, seconds in RANGES:
+            found = len(store.range(START, START + seconds))
+            print(f"{name:10} {found:10,} {lookup(store, seconds, False) * 1000:8.3f} ms "
+                  f"{lookup(store, seconds, True) * 1000:11.3f} ms")
+        del window
+        store.close()
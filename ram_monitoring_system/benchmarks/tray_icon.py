@@ -0,0 +1,72 @@
+"""
+Tray Icon Benchmark
+
+Per-tick cost of the tray icon update (rendering a new 256x256 image every
+tick vs swapping pre-rendered band icons), and the resident size of a
+monitor process (Linux) with and without the tray dependencies loaded.
+
+Run from the ram_monitoring_system folder:
+    python -m benchmarks.tray_icon
+"""
+
+import subprocess
+import sys
+import time
+from agents.monitor_agent import MonitorAgent, ICON_BANDS
+from core.message_bus import MessageBus
+
+
+TICKS = 2000
+# A slow drift through every band, like real RAM readings
+READINGS = [20 + (i % 400) / 10 for i in range(TICKS)]
+
+RSS_SCRIPT = """
+import os, sys
+from agents.monitor_agent import MonitorAgent, ICON_BANDS
+from core.message_bus import MessageBus
+agent = MonitorAgent(MessageBus(), headless=sys.argv[1] == "headless")
+if not agent.headless:
+    agent.icons = [agent.create_icon_image(color) for _, color in ICON_BANDS]
+with open("/proc/self/statm") as f:
+    print(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+"""
+
+
+class FakeTray:
+    icon = None
+    title = ""
+
+
+def per_tick_cpu(update):
+    cpu = time.process_time()
+    for ram in READINGS:
+        update(ram)
+    return (time.process_time() - cpu) / TICKS
+
+
+def rss_bytes(mode):
+    out = subprocess.run([sys.executable, "-c", RSS_SCRIPT, mode],
+                         capture_output=True, text=True, check=True)
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    agent = MonitorAgent(MessageBus())
+    agent.tray_icon = FakeTray()
+    agent.icons = [agent.create_icon_image(color) for _, color in ICON_BANDS]
+
+    def render_every_tick(ram):
+        agent.tray_icon.icon = agent.create_icon_image(ICON_BANDS[agent.band_for(ram)][1])
+        agent.tray_icon.title = f"RAM: {ram}%"
+
+    def headless(ram):
+        pass
+
+    for name, update in [("render every tick", render_every_tick),
+                         ("cached icons", agent.update_tray),
+                         ("headless", headless)]:
+        print(f"{name:<18} {per_tick_cpu(update) * 1e6:8.1f} us CPU/tick")
+
+    # pystray itself needs a desktop session, so only PIL is counted here
+    for mode in ("tray", "headless"):
+        print(f"{mode:<18} {rss_bytes(mode) / 2 ** 20:8.1f} MB RSS (PIL loaded: {mode == 'tray'})")
@@ -0,0 +1,159 @@
+"""
+Process Grouping
+
+Adds up memory per application, so fifty Chrome renderers or gunicorn
+workers show up as one entry instead of fifty small ones. Group modes:
+    name    processes with the same name
+    tree    a process plus its descendants with the same name (a browser
+            and its renderers, a gunicorn master and its workers)
+    user    owning user
+    cgroup  cgroup (systemd service, container); Linux only
+The grouper is fed by the collector's scan like the leak detector. A PID's
+group is resolved once, when it first appears (or reappears with another
+start time, i.e. the PID was reused); after that every sample only
+moves the difference from its previous RSS into the group total, and exited
+PIDs are subtracted at the end of the scan.
+"""
+
+import heapq
+import psutil
+from core.message import ProcessGroup
+
+MODES = ("name", "tree", "user", "cgroup")
+MAX_DEPTH = 64          # Ancestors climbed in tree mode
+
+
+class _Member:
+    __slots__ = ("group", "rss", "scan", "name", "ppid", "started")
+
+    def __init__(self, name, ppid, started):
+        self.group = None
+        self.rss = 0
+        self.scan = 0
+        self.name = name
+        self.ppid = ppid
+        self.started = started  # The collector's start time; changes when the PID is reused
+
+
+class _Group:
+    __slots__ = ("key", "label", "rss", "processes")
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.rss = 0
+        self.processes = 0
+
+
+class ProcessGrouper:
+    def __init__(self, mode="name"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown group mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.total = psutil.virtual_memory().total
+        self._members = {}      # pid -> _Member
+        self._groups = {}       # key -> _Group
+        self._scan = 0
+
+    def begin(self, now=None):
+        self._scan += 1
+
+    def observe(self, pid, rss, started):
+        member = self._members.get(pid)
+        if member is not None and member.started != started:
+            # A new process under a reused PID: its group may differ
+            self._leave(pid)
+            member = None
+        if member is None:
+            member = self._join(pid, started)
+            if member is None:
+                return
+        member.group.rss += rss - member.rss
+        member.rss = rss
+        member.scan = self._scan
+
+    def end(self):
+        """Subtract processes that were not seen in this scan."""
+        scan = self._scan
+        for pid in [pid for pid, member in self._members.items() if member.scan != scan]:
+            self._leave(pid)
+
+    def top(self, n):
+        groups = heapq.nlargest(n, self._groups.values(), key=lambda group: group.rss)
+        return [
+            ProcessGroup(group.label, round(group.rss * 100 / self.total, 2), group.processes)
+            for group in groups
+        ]
+
+    # ============ MEMBERSHIP ============
+    def _join(self, pid, started):
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                member = _Member(proc.name(), proc.ppid(), started)
+                key, label = self._key(pid, proc, member)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(key, label)
+        group.processes += 1
+        member.group = group
+        self._members[pid] = member
+        return member
+
+    def _leave(self, pid):
+        member = self._members.pop(pid)
+        group = member.group
+        group.rss -= member.rss
+        group.processes -= 1
+        if not group.processes:
+            del self._groups[group.key]
+
+    def _key(self, pid, proc, member):
+        if self.mode == "name":
+            return member.name, member.name
+        if self.mode == "user":
+            user = proc.username()
+            return user, user
+        if self.mode == "cgroup":
+            path = _cgroup_of(pid)
+            return path, path
+        # tree: climb while the parent has the same name
+        root, ppid = pid, member.ppid
+        for _ in range(MAX_DEPTH):
+            parent = self._identity(ppid)
+            if parent is None or parent[0] != member.name:
+                break
+            root, ppid = ppid, parent[1]
+        return ("tree", root), f"{member.name} ({root})"
+
+    def _identity(self, pid):
+        # (name, ppid) of a PID, from the members when it is one already
+        member = self._members.get(pid)
+        if member is not None:
+            return member.name, member.ppid
+        if pid <= 0:
+            return None
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                return proc.name(), proc.ppid()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+
+def _cgroup_of(pid):
+    # The v1 memory controller's path on hybrid hosts, else cgroup v2's
+    # "0::/system.slice/nginx.service"
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return "?"
+    paths = {}
+    for line in lines:
+        _, controllers, path = line.split(":", 2)
+        paths[controllers] = path
+    return paths.get("memory") or paths.get("") or "/"
@@ -0,0 +1,144 @@
+"""
+Leak Detector
+
+Follows the RSS of every process across monitor ticks and flags the ones
+that keep growing. Each PID has a fixed-size record:
+  - the running sums of an exponentially weighted linear regression of RSS
+    over time, updated in O(1) per sample, which gives the growth rate
+  - a short ring of per-minute RSS averages, used to confirm the growth is
+    spread out over time, so a one-off jump (a cache warming up) is not
+    reported as a leak
+Records of exited PIDs are dropped at the end of each scan, so memory stays
+proportional to the number of live processes; a PID that comes back with
+another start time (reused) starts a fresh record.
+"""
+
+from array import array
+from core.message import LeakSuspect
+
+# ============ CONFIGURATION ============
+HALF_LIFE = 600             # Seconds for a sample's weight in the slope to halve
+HISTORY_INTERVAL = 60       # Seconds averaged into one history point
+HISTORY_LENGTH = 32         # History points kept per PID
+MIN_HISTORY = 8             # History points needed before a PID can be flagged
+MIN_RATE = 1.0              # MB per minute of sustained growth to be suspected
+REPORT_INTERVAL = 600       # Seconds before the same PID is reported again
+
+MB = 1024 * 1024
+
+
+class _Trend:
+    __slots__ = ("first_seen", "last_seen", "sw", "st", "sy", "stt", "sty",
+                 "history", "points", "bucket_start", "bucket_sum", "bucket_count",
+                 "reported_at", "started")
+
+    def __init__(self, now, started):
+        self.started = started
+        self.first_seen = now
+        self.last_seen = now
+        # Weighted regression sums, with t measured from last_seen
+        self.sw = self.st = self.sy = self.stt = self.sty = 0.0
+        self.history = array("f", bytes(4 * HISTORY_LENGTH))    # MB
+        self.points = 0
+        self.bucket_start = now
+        self.bucket_sum = 0.0
+        self.bucket_count = 0
+        self.reported_at = None
+
+    def add(self, now, rss_mb):
+        dt = now - self.last_seen
+        if dt > 0:
+            # Move the time origin to now, then age every earlier sample
+            self.stt += dt * (dt * self.sw - 2 * self.st)
+            self.sty -= dt * self.sy
+            self.st -= dt * self.sw
+            decay = 0.5 ** (dt / HALF_LIFE)
+            self.sw *= decay
+            self.st *= decay
+            self.sy *= decay
+            self.stt *= decay
+            self.sty *= decay
+            self.last_seen = now
+        # The new sample sits at t = 0, so only sw and sy change
+        self.sw += 1
+        self.sy += rss_mb
+
+        if now - self.bucket_start >= HISTORY_INTERVAL and self.bucket_count:
+            self.history[self.points % HISTORY_LENGTH] = self.bucket_sum / self.bucket_count
+            self.points += 1
+            self.bucket_start = now
+            self.bucket_sum = 0.0
+            self.bucket_count = 0
+        self.bucket_sum += rss_mb
+        self.bucket_count += 1
+
+    def slope(self):
+        """Weighted growth in MB per second."""
+        denominator = self.sw * self.stt - self.st * self.st
+        if denominator <= 0:
+            return 0.0
+        return (self.sw * self.sty - self.st * self.sy) / denominator
+
+    def point(self, age):
+        """History point age intervals before the newest one."""
+        return self.history[(self.points - 1 - age) % HISTORY_LENGTH]
+
+    def sustained(self, rate):
+        # The history must have grown by at least half of what rate predicts,
+        # and no single step may account for half of that growth
+        span = min(self.points, HISTORY_LENGTH) - 1
+        growth = self.point(0) - self.point(span)
+        if growth < rate / 2 * span * HISTORY_INTERVAL / 60:
+            return False
+        largest = max(self.point(age) - self.point(age + 1) for age in range(span))
+        return largest < growth / 2
+
+    def latest(self):
+        return self.point(0)
+
+
+class LeakDetector:
+    def __init__(self):
+        self._trends = {}       # pid -> _Trend
+        self._now = 0.0
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._trends)
+
+    def begin(self, now):
+        """Start a scan at monotonic time now; then observe() every process."""
+        self._now = now
+        self._seen = set()
+
+    def observe(self, pid, rss, started):
+        trend = self._trends.get(pid)
+        if trend is None or trend.started != started:
+            trend = self._trends[pid] = _Trend(self._now, started)
+        trend.add(self._now, rss / MB)
+        self._seen.add(pid)
+
+    def end(self):
+        """Forget exited PIDs and return (pid, LeakSuspect without name) for new suspects."""
+        for pid in self._trends.keys() - self._seen:
+            del self._trends[pid]
+
+        now = self._now
+        suspects = []
+        for pid, trend in self._trends.items():
+            if trend.points < MIN_HISTORY:
+                continue
+            rate = trend.slope() * 60
+            if rate < MIN_RATE or not trend.sustained(MIN_RATE):
+                continue
+            if trend.reported_at is not None and now - trend.reported_at < REPORT_INTERVAL:
+                continue
+            trend.reported_at = now
+            suspects.append((pid, LeakSuspect(
+                pid=int(pid),
+                name=None,
+                rss_mb=round(trend.latest(), 1),
+                growth_mb_per_min=round(rate, 2),
+                observed_seconds=int(now - trend.first_seen)
+            )))
+        return suspects
@@ -0,0 +1,126 @@
+"""
+Memory Pressure Collector
+
+Linux signals that show memory trouble earlier than the used percentage:
+    /proc/pressure/memory   PSI: share of time tasks stalled waiting for memory
+    /proc/vmstat            swap-in / swap-out page rates
+    /proc/meminfo           swap usage
+    cgroup v2               memory.current, memory.max and memory.events of
+                            our own cgroup, when running inside a container
+Each source is optional; fields that cannot be read are left as None.
+"""
+
+import os
+import time
+from core.message import MemoryPressure
+
+PROC = "/proc"
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _find_cgroup_dir():
+    # cgroup v2 has one hierarchy; "0::/path" in /proc/self/cgroup is our
+    # place in it, relative to wherever cgroup2 is mounted
+    cgroups = _read(os.path.join(PROC, "self", "cgroup")) or ""
+    relative = None
+    for line in cgroups.splitlines():
+        if line.startswith("0::"):
+            relative = line[3:].lstrip("/")
+    if relative is None:
+        return None
+
+    mountinfo = _read(os.path.join(PROC, "self", "mountinfo")) or ""
+    for line in mountinfo.splitlines():
+        fields = line.split(" - ", 1)
+        if len(fields) == 2 and fields[1].startswith("cgroup2 "):
+            mount_point = fields[0].split()[4]
+            # In a container with its own cgroup namespace the mount is
+            # already our cgroup
+            for candidate in (os.path.join(mount_point, relative), mount_point):
+                if os.path.isfile(os.path.join(candidate, "memory.current")):
+                    return candidate
+    return None
+
+
+class PressureCollector:
+    @staticmethod
+    def supported():
+        return os.path.isfile(os.path.join(PROC, "vmstat"))
+
+    def __init__(self):
+        self.has_psi = os.path.isfile(os.path.join(PROC, "pressure", "memory"))
+        self.cgroup_dir = _find_cgroup_dir()
+        self._last_time = None
+        self._last_swaps = None         # (pswpin, pswpout)
+        self._last_events = None        # memory.events counters
+
+    def read(self):
+        now = time.monotonic()
+        pressure = MemoryPressure()
+        if self.has_psi:
+            self._read_psi(pressure)
+        self._read_swap(pressure, now)
+        if self.cgroup_dir is not None:
+            self._read_cgroup(pressure)
+        self._last_time = now
+        return pressure
+
+    def _read_psi(self, pressure):
+        # "some avg10=0.00 avg60=0.00 avg300=0.00 total=0"
+        data = _read(os.path.join(PROC, "pressure", "memory")) or ""
+        for line in data.splitlines():
+            kind, *fields = line.split()
+            values = dict(field.split("=") for field in fields)
+            if kind == "some":
+                pressure.psi_some_avg10 = float(values["avg10"])
+                pressure.psi_some_avg60 = float(values["avg60"])
+            elif kind == "full":
+                pressure.psi_full_avg10 = float(values["avg10"])
+                pressure.psi_full_avg60 = float(values["avg60"])
+
+    def _read_swap(self, pressure, now):
+        meminfo = {}
+        for line in (_read(os.path.join(PROC, "meminfo")) or "").splitlines():
+            if line.startswith("Swap"):
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        total = meminfo.get("SwapTotal", 0)
+        if total:
+            pressure.swap_percent = round((total - meminfo.get("SwapFree", 0)) / total * 100, 1)
+
+        swaps = [0, 0]
+        for line in (_read(os.path.join(PROC, "vmstat")) or "").splitlines():
+            if line.startswith("pswpin "):
+                swaps[0] = int(line.split()[1])
+            elif line.startswith("pswpout "):
+                swaps[1] = int(line.split()[1])
+        if self._last_swaps is not None and now > self._last_time:
+            elapsed = now - self._last_time
+            pressure.swap_in_per_sec = round((swaps[0] - self._last_swaps[0]) / elapsed, 1)
+            pressure.swap_out_per_sec = round((swaps[1] - self._last_swaps[1]) / elapsed, 1)
+        self._last_swaps = swaps
+
+    def _read_cgroup(self, pressure):
+        current = _read(os.path.join(self.cgroup_dir, "memory.current"))
+        limit = _read(os.path.join(self.cgroup_dir, "memory.max"))
+        if current is not None:
+            pressure.cgroup_current = int(current)
+        if limit is not None and limit.strip() != "max":
+            pressure.cgroup_max = int(limit)
+
+        # "low 0\nhigh 0\nmax 12\noom 0\noom_kill 0"; report what is new
+        events = {}
+        for line in (_read(os.path.join(self.cgroup_dir, "memory.events")) or "").splitlines():
+            key, value = line.split()
+            events[key] = int(value)
+        if self._last_events is not None:
+            pressure.cgroup_max_events = events.get("max", 0) - self._last_events.get("max", 0)
+            pressure.cgroup_oom_kills = events.get("oom_kill", 0) - self._last_events.get("oom_kill", 0)
+        self._last_events = events
@@ -0,0 +1,79 @@
+"""
+Process Table
+
+Persistent PID -> process cache for the monitor. Each refresh only creates
+entries for PIDs that appeared since the last tick and forgets PIDs that
+exited; names are read once per process, so a tick is one PID listing plus
+an identity check (the PID may have been reused since the last tick, as
+psutil.process_iter checks too) and a memory read per live process. The top
+N are picked with a heap instead of sorting every process.
+"""
+
+import heapq
+import psutil
+from core.message import ProcessEntry
+
+
+class _Tracked:
+    __slots__ = ("proc", "name")
+
+    def __init__(self, proc, name):
+        self.proc = proc
+        self.name = name
+
+
+class ProcessTable:
+    def __init__(self):
+        self._tracked = {}      # pid -> _Tracked
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def refresh(self):
+        pids = set(psutil.pids())
+        tracked = self._tracked
+
+        for pid in tracked.keys() - pids:
+            del tracked[pid]
+
+        # memory_info() doesn't notice a PID that was reused between ticks;
+        # is_running() compares the creation time
+        for pid in [pid for pid, entry in tracked.items() if not entry.proc.is_running()]:
+            del tracked[pid]
+
+        for pid in pids - tracked.keys():
+            try:
+                proc = psutil.Process(pid)
+                tracked[pid] = _Tracked(proc, proc.name())
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+    def top(self, n, observe=None):
+        """
+        The n processes using the most memory, largest first. observe, if
+        given, is called with (pid, rss in bytes, start time) for every process.
+        """
+        self.refresh()
+        total = psutil.virtual_memory().total
+        return [
+            ProcessEntry(name, round(rss * 100 / total, 2), pid)
+            for rss, name, pid in heapq.nlargest(n, self._usage(observe), key=lambda item: item[0])
+        ]
+
+    def name_of(self, pid):
+        entry = self._tracked.get(pid)
+        return entry.name if entry is not None else None
+
+    def _usage(self, observe):
+        # Yields (rss, name, pid); PIDs that vanished since refresh() are dropped
+        for pid, entry in list(self._tracked.items()):
+            try:
+                rss = entry.proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                self._tracked.pop(pid, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+            if observe is not None:
+                observe(pid, rss, entry.proc.create_time())
+            yield rss, entry.name, pid
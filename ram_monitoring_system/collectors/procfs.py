@@ -0,0 +1,151 @@
+"""
+procfs Collector
+
+Linux fast path for MonitorAgent that reads /proc directly instead of going
+through psutil. Same interface and results as PsutilCollector, but only the
+fields the monitor needs are parsed:
+    /proc/meminfo       MemTotal, MemAvailable
+    /proc/[pid]/stat    resident pages and start time (which tells a reused
+                        PID from the process that had it before)
+PIDs are listed with os.scandir, reads go into reusable buffers, and names
+are only looked up for the top N processes.
+"""
+
+import heapq
+import os
+from core.message import ProcessEntry
+
+PROC = "/proc"
+# psutil.Process.name() expands names the kernel truncated to 15 characters
+COMM_LENGTH = 15
+
+
+def _meminfo_field(buf, size, key):
+    start = buf.find(key, 0, size)
+    if start < 0:
+        return None
+    end = buf.find(b"\n", start, size)
+    # "MemTotal:       16314384 kB"
+    return int(buf[start + len(key):end - 3]) * 1024
+
+
+class MemInfo:
+    """
+    /proc/meminfo reader. Keeps the file open and reads into one buffer, so
+    each thread sampling RAM needs its own instance.
+    """
+
+    def __init__(self):
+        self._file = open(os.path.join(PROC, "meminfo"), "rb", buffering=0)
+        self._buf = bytearray(8192)
+
+    def read(self):
+        """(total, available) in bytes."""
+        # Re-reading from offset 0 makes the kernel regenerate the file
+        self._file.seek(0)
+        size = self._file.readinto(self._buf)
+        total = _meminfo_field(self._buf, size, b"MemTotal:")
+        available = _meminfo_field(self._buf, size, b"MemAvailable:")
+        if available is None:
+            # Kernels before 3.14, same fallback as psutil
+            available = _meminfo_field(self._buf, size, b"MemFree:")
+        return total, available
+
+    def percent(self):
+        total, available = self.read()
+        return round((total - available) / total * 100, 1)
+
+    def close(self):
+        self._file.close()
+
+
+class ProcfsCollector:
+    name = "procfs"
+
+    @staticmethod
+    def supported():
+        return os.path.isfile(os.path.join(PROC, "meminfo"))
+
+    def __init__(self):
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.meminfo = MemInfo()
+        self._stat_buf = bytearray(2048)
+        self._name_buf = bytearray(4096)
+        self.total = self.meminfo.read()[0]
+
+    def get_ram_percent(self):
+        return self.meminfo.percent()
+
+    def ram_reader(self):
+        # For the high-resolution sampler thread
+        return MemInfo().percent
+
+    def get_top_processes(self, n, observe=None):
+        # observe, if given, is called with (pid, rss in bytes, start time)
+        # for every process
+        top = heapq.nlargest(n, self._resident_pages(observe), key=lambda item: item[0])
+        processes = []
+        for pages, pid in top:
+            name = self._name(pid)
+            if name is not None:
+                processes.append(ProcessEntry(name, round(pages * self.page_size * 100 / self.total, 2), pid))
+        return processes
+
+    def process_name(self, pid):
+        return self._name(pid)
+
+    def _resident_pages(self, observe):
+        # Yields (resident pages, pid) for every live process
+        buf = self._stat_buf
+        page_size = self.page_size
+        with os.scandir(PROC) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                # An int, like the PIDs psutil hands ProcessTable observers
+                pid = int(entry.name)
+                size = self._read_into(f"{PROC}/{pid}/stat", buf)
+                if size:
+                    # "pid (comm) state ppid ..."; comm may contain spaces and
+                    # parentheses, so fields are counted from the last ")"
+                    fields = buf[buf.rfind(b")", 0, size) + 2:size].split(b" ", 22)
+                    pages = int(fields[21])
+                    if observe is not None:
+                        observe(pid, pages * page_size, int(fields[19]))
+                    yield pages, pid
+
+    def _read_into(self, path, buf):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:     # Exited since the listing, or not ours to read
+            return 0
+        try:
+            return os.readv(fd, (buf,))
+        except OSError:
+            return 0
+        finally:
+            os.close(fd)
+
+    def _name(self, pid):
+        buf = self._name_buf
+        size = self._read_into(f"{PROC}/{pid}/comm", buf)
+        if not size:
+            return None
+        name = buf[:size].rstrip(b"\n").decode(errors="replace")
+        if len(name) >= COMM_LENGTH:
+            # Same rule as psutil: use the executable from the command line
+            # when it starts with the truncated name
+            size = self._read_into(f"{PROC}/{pid}/cmdline", buf)
+            if size:
+                data = bytes(buf[:size])
+                sep = b"\0" if data.endswith(b"\0") else b" "
+                args = data.rstrip(sep).split(sep)
+                if sep == b"\0" and len(args) == 1 and b" " in args[0]:
+                    args = args[0].split(b" ")
+                extended = os.path.basename(args[0].decode(errors="replace"))
+                if extended.startswith(name):
+                    name = extended
+        return name
+
+    def close(self):
+        self.meminfo.close()
@@ -0,0 +1,28 @@
+"""
+psutil Collector
+
+Portable RAM and top-process collector used by MonitorAgent by default.
+"""
+
+import psutil
+from collectors.process_table import ProcessTable
+
+
+class PsutilCollector:
+    name = "psutil"
+
+    def __init__(self):
+        self.process_table = ProcessTable()
+
+    def get_ram_percent(self):
+        return psutil.virtual_memory().percent
+
+    def ram_reader(self):
+        # For the high-resolution sampler thread; psutil keeps no state here
+        return self.get_ram_percent
+
+    def get_top_processes(self, n, observe=None):
+        return self.process_table.top(n, observe)
+
+    def process_name(self, pid):
+        return self.process_table.name_of(pid)
@@ -0,0 +1,79 @@
+"""
+High-Resolution RAM Sampler
+
+Samples system RAM percent at 10-100 Hz on its own thread, so spikes
+shorter than the monitor's tick are not missed. Samples go into a
+preallocated array('f') ring buffer (no object kept per sample), and the
+monitor drains min/max/mean of everything sampled since its last tick.
+"""
+
+import threading
+import time
+from array import array
+
+
+class Window:
+    __slots__ = ("min", "max", "mean")
+
+    def __init__(self, low, high, mean):
+        self.min = low
+        self.max = high
+        self.mean = mean
+
+
+class HighResSampler:
+    def __init__(self, read_percent, rate=20, seconds=30):
+        """
+        read_percent: thread-safe callable returning RAM percent
+        rate: samples per second
+        seconds: ring buffer length; must cover the longest monitor tick
+        """
+        self.read_percent = read_percent
+        self.period = 1 / rate
+        self.capacity = int(rate * seconds)
+        self._ring = array("f", bytes(4 * self.capacity))
+        self._written = 0       # Total samples ever written; only the sampler thread writes it
+        self._drained = 0       # Samples already handed out by drain()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="HighResSampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        ring = self._ring
+        capacity = self.capacity
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            ring[self._written % capacity] = self.read_percent()
+            self._written += 1
+
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()     # Fell behind; don't burst to catch up
+
+    def drain(self):
+        """Window of the samples taken since the last drain, or None."""
+        end = self._written
+        start = max(self._drained, end - self.capacity)
+        self._drained = end
+        if start == end:
+            return None
+
+        ring = memoryview(self._ring)
+        first, last = start % self.capacity, end % self.capacity
+        if first < last:
+            parts = (ring[first:last],)
+        else:
+            parts = (ring[first:], ring[:last])
+        return Window(
+            min(min(part) for part in parts if len(part)),
+            max(max(part) for part in parts if len(part)),
+            sum(sum(part) for part in parts) / (end - start)
+        )
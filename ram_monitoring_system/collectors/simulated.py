@@ -0,0 +1,97 @@
+"""
+Simulated Sources
+
+Stand-ins for the real collectors, for load testing everything downstream
+of the monitor. A source is an iterator of (seconds since start, RamSample):
+    SyntheticSource   baseline with noise, slow ramps and short spikes
+    TraceSource       replays a recorded trace: a LoggerAgent CSV
+                      (ram_log.csv and its rolled segments) or a bus
+                      journal (main.py --journal)
+SimulatorAgent publishes them for many hosts at N x wall clock speed.
+"""
+
+import os
+import random
+from datetime import datetime
+from core import journal, log_segments
+from core.message import ProcessEntry, RamSample
+
+# ============ CONFIGURATION ============
+SYNTHETIC_INTERVAL = 5      # Simulated seconds between synthetic samples
+RAMP_PERIOD = 900           # Simulated seconds between the starts of two ramps
+RAMP_DURATION = 300
+RAMP_HEIGHT = 30            # Percentage points climbed by a ramp
+SPIKE_CHANCE = 0.01         # Per sample
+SPIKE_HEIGHT = 35
+
+PROCESS_NAMES = ("chrome", "java", "postgres", "gunicorn", "node", "python")
+
+
+class SyntheticSource:
+    def __init__(self, seed=0, interval=SYNTHETIC_INTERVAL, duration=None):
+        self.rng = random.Random(seed)
+        self.interval = interval
+        self.duration = duration
+        self.base = self.rng.uniform(20, 40)
+        # Hosts don't all ramp at the same moment
+        self.phase = self.rng.uniform(0, RAMP_PERIOD)
+        self.processes = self.rng.sample(PROCESS_NAMES, 3)
+
+    def __iter__(self):
+        rng = self.rng
+        t = 0.0
+        while self.duration is None or t <= self.duration:
+            into_period = (t + self.phase) % RAMP_PERIOD
+            ram = self.base + rng.gauss(0, 1.5)
+            if into_period < RAMP_DURATION:
+                ram += RAMP_HEIGHT * into_period / RAMP_DURATION
+            spike = SPIKE_HEIGHT if rng.random() < SPIKE_CHANCE else 0
+            ram = round(min(max(ram, 0), 100), 1)
+            top = [
+                ProcessEntry(name, round(ram * share, 2))
+                for name, share in zip(self.processes, (0.3, 0.15, 0.05))
+            ]
+            # A spike shows up in the high-resolution peak, not the tick reading
+            peak = round(min(ram + spike, 100), 1)
+            yield t, RamSample(ram, top, ram_min=ram, ram_max=peak, ram_mean=ram)
+            t += self.interval
+
+
+class TraceSource:
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        if self.path.endswith(".csv"):
+            return self._read_csv()
+        return self._read_journal()
+
+    def _read_csv(self):
+        # Timestamp, Event, RAM%, Details, Top Processes ("name(1.2%), ...")
+        start = None
+        for row in log_segments.read_rows(self.path):
+            at = datetime.strptime(row["Timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+            if start is None:
+                start = at
+            processes = []
+            for item in filter(None, row["Top Processes"].split(", ")):
+                name, _, memory = item.rpartition("(")
+                processes.append(ProcessEntry(name, float(memory.rstrip("%)"))))
+            yield at - start, RamSample(float(row["RAM%"].rstrip("%")), processes)
+
+    def _read_journal(self):
+        start = None
+        # Oldest first: the rolled-over segment, then the live file
+        segments = [p for p in (self.path + ".1", self.path) if os.path.isfile(p)]
+        messages = (m for segment in segments for m in journal.read(segment, {"RAM_DATA"}))
+        for message in messages:
+            if start is None:
+                start = message.wall_time
+            payload = message.payload
+            processes = [ProcessEntry(p["name"], p["memory"]) for p in payload["top_processes"]]
+            yield message.wall_time - start, RamSample(
+                payload["ram_percent"], processes,
+                ram_min=payload.get("ram_min"),
+                ram_max=payload.get("ram_max"),
+                ram_mean=payload.get("ram_mean")
+            )
@@ -0,0 +1,91 @@
+"""
+PSS Collector
+
+RSS counts every shared page (libraries, fork()ed memory, shared memory) in
+full for each process using it, so the top-process list can blame the
+wrong process. This collector wraps the psutil or procfs collector: the
+cheap RSS pass picks candidates, then /proc/[pid]/smaps_rollup is read for
+those only, on a small thread pool and within a time budget per tick.
+Memory is then reported as PSS (shared pages split between their users)
+plus USS (pages only that process uses). Candidates whose rollup could not
+be read in time, or at all (other users' processes, unless root), keep their
+RSS figure and no USS. RSS is never below PSS, so they are ranked after the
+measured ones instead of in the same sort.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+PROC = "/proc"
+
+# ============ CONFIGURATION ============
+CANDIDATES = 4          # Candidates per reported process from the RSS pass
+TIME_BUDGET = 0.25      # Seconds per tick to wait for smaps_rollup reads
+WORKERS = 4
+
+
+def read_rollup(pid):
+    """(PSS, USS) in bytes from /proc/[pid]/smaps_rollup, or None."""
+    try:
+        with open(f"{PROC}/{pid}/smaps_rollup", "rb") as f:
+            data = f.read()
+    except OSError:     # Exited, or not ours to read (needs ptrace access)
+        return None
+    pss = uss = 0
+    for line in data.splitlines():
+        if line.startswith(b"Pss:"):
+            pss = int(line.split()[1]) * 1024
+        elif line.startswith((b"Private_Clean:", b"Private_Dirty:")):
+            uss += int(line.split()[1]) * 1024
+    return pss, uss
+
+
+class PssCollector:
+    @staticmethod
+    def supported():
+        return os.path.isfile(f"{PROC}/self/smaps_rollup")
+
+    def __init__(self, base):
+        self.base = base
+        self.name = f"{base.name}+pss"
+        self.total = self._total_bytes()
+        self._pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="PssCollector")
+
+    def _total_bytes(self):
+        with open(f"{PROC}/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) * 1024
+
+    def get_ram_percent(self):
+        return self.base.get_ram_percent()
+
+    def ram_reader(self):
+        return self.base.ram_reader()
+
+    def process_name(self, pid):
+        return self.base.process_name(pid)
+
+    def get_top_processes(self, n, observe=None):
+        candidates = self.base.get_top_processes(n * CANDIDATES, observe)
+        futures = {self._pool.submit(read_rollup, proc.pid): proc for proc in candidates}
+        done, not_done = wait(futures, timeout=TIME_BUDGET)
+        for future in not_done:
+            future.cancel()
+
+        measured = []
+        for future in done:
+            rollup = future.result()
+            if rollup is not None:
+                proc = futures[future]
+                pss, uss = rollup
+                proc.memory = round(pss * 100 / self.total, 2)
+                proc.uss = round(uss * 100 / self.total, 2)
+                measured.append(proc)
+        measured.sort(key=lambda proc: proc.memory, reverse=True)
+        # Still in RSS order from the base collector
+        unmeasured = [proc for proc in candidates if proc.uss is None]
+        return (measured + unmeasured)[:n]
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
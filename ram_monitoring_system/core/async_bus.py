@@ -0,0 +1,185 @@
+import asyncio
+import dataclasses
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.message_bus import (
+    MessageBus, DEFAULT_LANE_SIZE, DEFAULT_QUEUE_SIZE, resolve_policy, _callback_name
+)
+
+# ============ CONFIGURATION ============
+DEFAULT_BLOCKING_WORKERS = 4   # Threads for blocking calls (psutil, smtplib, sleeps)
+
+
+def nonblocking(callback):
+    """Mark a plain callback as cheap enough to run directly on the event loop."""
+    callback._bus_nonblocking = True
+    return callback
+
+
+class AsyncMessageBus(MessageBus):
+    """
+    asyncio counterpart of MessageBus.
+
+    The router and one consumer task per subscriber lane all live on a single
+    event loop, so an idle system has no polling threads at all. Lanes,
+    backpressure policies and priorities behave exactly as on MessageBus.
+    Callbacks are run as follows:
+      - async def callbacks are awaited on the loop
+      - callbacks marked @nonblocking are called on the loop
+      - everything else goes to a small thread pool (the escape hatch for
+        SMTP, popups and other blocking work)
+    """
+
+    is_async = True
+
+    def __init__(self, blocking_workers=DEFAULT_BLOCKING_WORKERS,
+                 lane_size=DEFAULT_LANE_SIZE, queue_size=DEFAULT_QUEUE_SIZE, journal=None):
+        super().__init__(workers=0, lane_size=lane_size, queue_size=queue_size, journal=journal)
+        self._queue = asyncio.PriorityQueue(maxsize=queue_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=blocking_workers,
+            thread_name_prefix="AsyncMessageBus-blocking"
+        )
+        self._loop = None
+        self._loop_thread = None
+        self._early = []            # Published before the loop started
+        self._tasks = set()         # Strong refs so running tasks aren't collected
+        self._consumers = {}        # lane -> consumer tasks
+
+    # ============ LOOP PLUMBING ============
+    def _bind_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+
+    def create_task(self, coro):
+        self._bind_loop()
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run_blocking(self, func, *args):
+        self._bind_loop()
+        return await self._loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    # ============ PUBLISH / ROUTE ============
+    def publish(self, message, priority=None):
+        # Safe to call from the loop or from any thread (e.g. a callback
+        # running in the blocking pool)
+        if priority is not None and priority != message.priority:
+            message = dataclasses.replace(message, priority=priority)
+        self.metrics.event(message.event_type).published += 1
+        if self.journal is not None:
+            self.journal.append(message)
+        item = (message.priority, next(self._seq), time.monotonic(), message)
+
+        if self._loop is None:
+            self._early.append(item)
+        elif threading.get_ident() == self._loop_thread:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.create_task(self._queue.put(item))
+        else:
+            # Blocks the publishing thread while the queue is full
+            asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+    async def start_routing(self):
+        self._bind_loop()
+        self._running = True
+        for item in self._early:
+            await self._queue.put(item)
+        self._early = []
+
+        while self._running:
+            _, _, published_at, message = await self._queue.get()
+            if message is None:
+                break
+            self.metrics.event(message.event_type).queue_wait.observe(time.monotonic() - published_at)
+            self._route(message)
+
+    def _route(self, message):
+        for lane, callback, policy, stats in self.subscribers_for(message.event_type):
+            self._dispatch(lane, callback, message, resolve_policy(policy, message.event_type), stats)
+
+    def _dispatch(self, lane, callback, message, policy, stats):
+        if lane not in self._consumers:
+            self._start_consumers(lane)
+        with lane.lock:
+            if not lane.offer(callback, message, policy, stats):
+                return
+        lane.has_work.set()
+
+    # ============ LANE CONSUMERS ============
+    def _start_consumers(self, lane):
+        lane.has_work = asyncio.Event()
+        self._consumers[lane] = [
+            self.create_task(self._consume(lane))
+            for _ in range(lane.max_concurrency)
+        ]
+
+    async def _consume(self, lane):
+        while True:
+            with lane.lock:
+                entry = lane.take()
+                if entry is not None:
+                    lane.active += 1
+                    started = time.monotonic()
+                    lane.last_wait = started - entry.enqueued_at
+            if entry is None:
+                if lane.retired:
+                    self._consumers.pop(lane, None)
+                    return
+                # Parked until the router hands this lane more work
+                lane.has_work.clear()
+                await lane.has_work.wait()
+                continue
+            stats = entry.stats
+            stats.lane_wait.observe(lane.last_wait)
+
+            if not await self._invoke(entry.callback, entry.message):
+                stats.errors += 1
+            stats.calls += 1
+            stats.duration.observe(time.monotonic() - started)
+
+            with lane.lock:
+                lane.active -= 1
+                lane.delivered += 1
+
+    def _retire_lane(self, lane):
+        super()._retire_lane(lane)
+        if lane in self._consumers:
+            # Wake the parked consumers so they drain what is left and exit
+            self._loop.call_soon_threadsafe(lane.has_work.set)
+
+    async def _invoke(self, callback, message):
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                await callback(message)
+            elif getattr(callback, "_bus_nonblocking", False):
+                callback(message)
+            else:
+                await self._loop.run_in_executor(self._executor, callback, message)
+            return True
+        except Exception as e:
+            print(f"[AsyncMessageBus] {_callback_name(callback)} failed on {message.event_type}: {e}")
+            return False
+
+    def _wake_router(self, sentinel):
+        try:
+            self._queue.put_nowait(sentinel)
+        except asyncio.QueueFull:
+            pass    # The router is busy and sees _running before its next get()
+
+    def stop(self):
+        self._running = False
+        # After Ctrl+C asyncio.run() has already closed the loop
+        if self._loop is not None and not self._loop.is_closed():
+            sentinel = (-1, next(self._seq), 0.0, None)
+            self._loop.call_soon_threadsafe(self._wake_router, sentinel)
+        self._executor.shutdown(wait=False)
+        if self.journal is not None:
+            self.journal.close()
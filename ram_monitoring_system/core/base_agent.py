@@ -24,7 +24,10 @@ class BaseAgent(ABC):
 
     def start(self):
         print(f"[{self.name}] Starting...")
-        self._thread.start()
+        if self.bus.is_async:
+            self.bus.create_task(self._run_safe_async())
+        else:
+            self._thread.start()
 
     def _run_safe(self):
         try:
@@ -32,6 +35,26 @@ class BaseAgent(ABC):
         except Exception as e:
             print(f"[{self.name}] CRASHED: {e}")
 
+    async def _run_safe_async(self):
+        try:
+            await self.run_async()
+        except Exception as e:
+            print(f"[{self.name}] CRASHED: {e}")
+
     @abstractmethod
     def run(self):
-        pass
\ No newline at end of file
+        pass
+
+    def stop(self):
+        # Called on shutdown; agents that buffer output flush it here
+        pass
+
+    # ============ ASYNC VARIANT ============
+    # On an AsyncMessageBus the agent runs as a task on the bus event loop
+    # instead of a thread. run() must then return quickly; agents with a
+    # loop override run_async() and await run_blocking() for blocking calls.
+    async def run_async(self):
+        self.run()
+
+    async def run_blocking(self, func, *args):
+        return await self.bus.run_blocking(func, *args)
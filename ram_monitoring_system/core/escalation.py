@@ -0,0 +1,236 @@
+"""
+Escalation Policy Engine
+
+Escalation is described as data instead of code:
+    Condition   a sample field compared to a threshold, with a lower clear
+                level for hysteresis ("peak" or "pressure.psi_some_avg10"),
+                and optionally a steadier field that must hold the breach
+    Step        an event published once a breach has lasted `after` seconds,
+                with a severity, an optional cooldown between firings, and
+                optionally only once the steadier field confirms the breach
+    Rule        conditions (any one breaches, all must clear), its steps in
+                order, and the event published when the breach clears
+The engine keeps the state of every (host, rule) pair in a few flat array
+columns indexed by a host slot, so evaluating a sample is a constant amount
+of work however many hosts there are. Hosts are spread over a fixed set of
+striped locks, so samples of different hosts rarely wait for each other.
+"""
+
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+
+# ============ CONFIGURATION ============
+LOCK_STRIPES = 64
+NEVER = -math.inf
+
+
+@dataclass(frozen=True, slots=True)
+class Condition:
+    field: str          # RamSample attribute, dotted for nested records
+    above: float        # Breaches at or above this value
+    clear: float = None # Back to normal below this value; None = same as above
+    sustained: str = None   # Field held against clear and confirm; None = same as field
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    after: float        # Seconds into the breach
+    event: str
+    severity: str
+    cooldown: float = 0 # Seconds before this step may fire again after firing
+    confirm: bool = False   # Counts `after` from when a sustained value reached its threshold
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    name: str
+    conditions: tuple
+    steps: tuple
+    clear_event: str = None
+
+
+def _getter(field):
+    # Like operator.attrgetter, but None part-way ("pressure" off) gives None
+    parts = field.split(".")
+
+    def get(sample):
+        value = sample
+        for part in parts:
+            value = getattr(value, part)
+            if value is None:
+                return None
+        return value
+    return get
+
+
+class _RuleState:
+    """Columns of one rule, one entry per host slot."""
+    __slots__ = ("rule", "checks", "since", "confirmed_since", "level", "restored", "fired")
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.checks = tuple(
+            (_getter(c.field), None if c.sustained is None else _getter(c.sustained),
+             c.above, c.above if c.clear is None else c.clear)
+            for c in rule.conditions
+        )
+        self.since = array("d")         # Breach start, NaN when normal
+        self.confirmed_since = array("d")   # First sustained reading at the threshold, or NaN
+        self.level = array("B")         # Steps passed in the current breach
+        self.restored = array("B")      # Breach rebuilt by restore(), not yet re-checked
+        self.fired = [array("d") for _ in rule.steps]     # Last firing per step
+
+    def add_slot(self):
+        self.since.append(math.nan)
+        self.confirmed_since.append(math.nan)
+        self.level.append(0)
+        self.restored.append(0)
+        for column in self.fired:
+            column.append(NEVER)
+
+    def evaluate(self, slot, sample, now, fired):
+        since = self.since[slot]
+        was_breached = not math.isnan(since)
+        # A restored breach must be confirmed by a fresh sample against the
+        # breach thresholds before hysteresis keeps it going
+        hysteresis = was_breached and not self.restored[slot]
+        self.restored[slot] = 0
+        breached = confirmed = False
+        for get, sustained, above, clear in self.checks:
+            value = get(sample)
+            held = value if sustained is None else sustained(sample)
+            if held is not None and held >= above:
+                breached = confirmed = True
+                break
+            if value is not None and value >= above:
+                breached = True
+            # Hysteresis: a breach lasts while a sustained value is above its
+            # clear level, so a one-off spike can't hold it open
+            elif hysteresis and held is not None and held >= clear:
+                breached = True
+        if breached and not was_breached:
+            since = self.since[slot] = now
+            self.confirmed_since[slot] = math.nan
+            self.level[slot] = 0
+
+        rule = self.rule
+        if breached:
+            confirmed_since = self.confirmed_since[slot]
+            if confirmed and math.isnan(confirmed_since):
+                confirmed_since = self.confirmed_since[slot] = now
+            level = self.level[slot]
+            steps = rule.steps
+            while level < len(steps) and now - since >= steps[level].after:
+                step = steps[level]
+                # Confirmed steps count from when the breach was confirmed,
+                # so time spent held open below the threshold doesn't count
+                if step.confirm and not (confirmed and now - confirmed_since >= step.after):
+                    break
+                if now - self.fired[level][slot] >= step.cooldown:
+                    self.fired[level][slot] = now
+                    fired.append((step.event, step.severity))
+                level += 1
+            self.level[slot] = level
+        elif was_breached:
+            self.since[slot] = math.nan
+            self.confirmed_since[slot] = math.nan
+            if self.level[slot] and rule.clear_event:
+                fired.append((rule.clear_event, "normal"))
+            self.level[slot] = 0
+
+    def restore(self, slot, event_type, at):
+        # Replays one previously published event of this rule
+        if event_type == self.rule.clear_event:
+            self.reset(slot)
+            return
+        for index, step in enumerate(self.rule.steps):
+            if step.event == event_type:
+                if index == 0 or math.isnan(self.since[slot]):
+                    # The previous run's timeline, confirmation included
+                    self.since[slot] = self.confirmed_since[slot] = at - step.after
+                    self.level[slot] = 0
+                self.level[slot] = max(self.level[slot], index + 1)
+                self.restored[slot] = 1
+                self.fired[index][slot] = at
+
+    def reset(self, slot):
+        # Back to normal without a clear event; step cooldowns are kept
+        self.since[slot] = math.nan
+        self.confirmed_since[slot] = math.nan
+        self.level[slot] = 0
+        self.restored[slot] = 0
+
+
+class EscalationEngine:
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self._states = tuple(_RuleState(rule) for rule in self.rules)
+        self._slots = {}            # host -> slot
+        self._seen = array("d")     # Newest sample time per slot
+        self._locks = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+        self._grow_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def event_types(self):
+        events = set()
+        for rule in self.rules:
+            events.update(step.event for step in rule.steps)
+            if rule.clear_event:
+                events.add(rule.clear_event)
+        return events
+
+    def evaluate(self, host, sample, now):
+        """(event, severity) pairs to publish for this host's sample at `now`."""
+        slot = self._slot(host)
+        fired = []
+        with self._locks[slot % LOCK_STRIPES]:
+            # With several workers a host's samples can arrive out of order
+            if now < self._seen[slot]:
+                return fired
+            self._seen[slot] = now
+            for state in self._states:
+                state.evaluate(slot, sample, now, fired)
+        return fired
+
+    def restore(self, host, event_type, at):
+        """Rebuild state from an event published at `at` before a restart."""
+        slot = self._slot(host)
+        with self._locks[slot % LOCK_STRIPES]:
+            for state in self._states:
+                state.restore(slot, event_type, at)
+
+    def reset(self, host):
+        """Forget any breach of a host (e.g. a stale restored one), keeping step cooldowns."""
+        slot = self._slot(host)
+        with self._locks[slot % LOCK_STRIPES]:
+            for state in self._states:
+                state.reset(slot)
+
+    def breach(self, host, rule_name):
+        """(breach start, steps passed) of a host's rule, or None when normal."""
+        slot = self._slots.get(host)
+        if slot is None:
+            return None
+        for state in self._states:
+            if state.rule.name == rule_name and not math.isnan(state.since[slot]):
+                return state.since[slot], state.level[slot]
+        return None
+
+    def _slot(self, host):
+        slot = self._slots.get(host)
+        if slot is None:
+            with self._grow_lock:
+                slot = self._slots.get(host)
+                if slot is None:
+                    # Columns grow before the slot is published, so readers
+                    # never see a slot without its row
+                    slot = len(self._seen)
+                    for state in self._states:
+                        state.add_slot()
+                    self._seen.append(NEVER)
+                    self._slots[host] = slot
+        return slot
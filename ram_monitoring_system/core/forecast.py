@@ -0,0 +1,86 @@
+"""
+Breach Forecaster
+
+Predicts when RAM will cross the escalation threshold, so warnings can go
+out before the machine is already swapping. Each host has a Holt linear
+trend model (exponential smoothing of the level and of its slope), updated
+in O(1) per sample. Samples arrive at irregular intervals (the monitor
+samples faster near the threshold), so the smoothing factors are derived
+from half-lives in seconds rather than fixed per sample.
+
+A forecast is issued when the smoothed level, extended along its trend,
+reaches the threshold within HORIZON seconds. It is issued once per rise:
+the host is re-armed once its trend stops rising while below the threshold.
+"""
+
+from core.message import BreachForecast
+
+# ============ CONFIGURATION ============
+LEVEL_HALF_LIFE = 5         # Seconds for a sample's weight in the level to halve
+TREND_HALF_LIFE = 30        # Seconds for a slope's weight in the trend to halve
+HORIZON = 120               # Seconds ahead a breach is predicted
+MIN_TREND = 2.0             # Percentage points per minute to count as rising
+WARMUP = 30                 # Seconds of history before the first forecast
+
+
+class _Holt:
+    __slots__ = ("first_seen", "last_seen", "level", "trend", "armed")
+
+    def __init__(self, now, value):
+        self.first_seen = now
+        self.last_seen = now
+        self.level = value
+        self.trend = 0.0            # Percentage points per second
+        self.armed = True
+
+    def add(self, now, value):
+        dt = now - self.last_seen
+        if dt <= 0:
+            return
+        alpha = 1 - 0.5 ** (dt / LEVEL_HALF_LIFE)
+        beta = 1 - 0.5 ** (dt / TREND_HALF_LIFE)
+        level = alpha * value + (1 - alpha) * (self.level + self.trend * dt)
+        self.trend = beta * (level - self.level) / dt + (1 - beta) * self.trend
+        self.level = level
+        self.last_seen = now
+
+
+class BreachForecaster:
+    def __init__(self, threshold, horizon=HORIZON):
+        self.threshold = threshold
+        self.horizon = horizon
+        self._models = {}       # host -> _Holt
+
+    def __len__(self):
+        return len(self._models)
+
+    def update(self, host, sample, now):
+        """Feed one RamSample; returns a BreachForecast when a breach is predicted."""
+        # The mean of the high-resolution samples is the least noisy reading
+        value = sample.ram_percent if sample.ram_mean is None else sample.ram_mean
+        model = self._models.get(host)
+        if model is None:
+            self._models[host] = _Holt(now, value)
+            return None
+        model.add(now, value)
+
+        per_minute = model.trend * 60
+        if value >= self.threshold or per_minute < MIN_TREND:
+            # Already breaching (escalation takes over), or no longer rising
+            if per_minute < MIN_TREND and value < self.threshold:
+                model.armed = True
+            return None
+        if not model.armed or now - model.first_seen < WARMUP:
+            return None
+
+        seconds = (self.threshold - model.level) / model.trend
+        if seconds > self.horizon:
+            return None
+        model.armed = False
+        return BreachForecast(
+            ram_percent=round(model.level, 1),
+            threshold=self.threshold,
+            seconds_to_breach=round(max(seconds, 0), 1),
+            trend_per_min=round(per_minute, 2),
+            top_processes=sample.top_processes
+        )
@@ -0,0 +1,200 @@
+"""
+Message Journal
+
+Optional append-only write-ahead log of every message published on the bus,
+so state can be rebuilt after a crash or a restart by RestartAgent.
+
+Record framing (little endian):
+    uint32 body length | uint32 crc32(body) | body
+    body = float64 wall time | int8 priority | uint8 len(event_type)
+           | uint8 len(sender) | event_type | sender | payload as compact JSON
+
+Appends only queue the message; a writer thread collects a batch for up to
+fsync_interval seconds (or batch_size messages), encodes it, writes it with
+one call and fsyncs once per batch. A crash can lose at most one batch. A torn record at the end of the file
+is detected by its length/CRC and cut off when the journal is reopened.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from core.message import Message, mono_ns_from_wall
+
+# ============ CONFIGURATION ============
+DEFAULT_FSYNC_INTERVAL = 0.5        # Longest a message waits to be made durable
+DEFAULT_BATCH_SIZE = 1000           # Write early once this many messages are queued
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # Roll over to a fresh file past this size
+
+RECORD_HEADER = struct.Struct("<II")
+BODY_HEADER = struct.Struct("<dbBB")
+
+
+def _encode_payload(payload):
+    return json.dumps(payload, separators=(",", ":"), default=_json_default).encode()
+
+
+def _json_default(value):
+    # Payload records (RamSample, ProcessEntry) are journaled as plain dicts
+    if hasattr(value, "__dataclass_fields__"):
+        return {name: getattr(value, name) for name in value.__dataclass_fields__}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot journal {type(value).__name__}")
+
+
+def encode(message):
+    event_type = message.event_type.encode()
+    sender = message.sender.encode()
+    body = b"".join((
+        BODY_HEADER.pack(message.wall_time, message.priority,
+                         len(event_type), len(sender)),
+        event_type,
+        sender,
+        _encode_payload(message.payload),
+    ))
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _scan(data, event_types=None):
+    # Yields (end offset, message or None) for every intact record. Messages
+    # not in event_types are skipped without decoding their payload
+    view = memoryview(data)
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + length
+        if end > len(data) or zlib.crc32(view[start:end]) != crc:
+            return
+        wall, priority, type_len, sender_len = BODY_HEADER.unpack_from(data, start)
+        pos = start + BODY_HEADER.size
+        event_type = str(view[pos:pos + type_len], "utf-8")
+        message = None
+        if event_types is None or event_type in event_types:
+            pos += type_len
+            sender = str(view[pos:pos + sender_len], "utf-8")
+            payload = json.loads(view[pos + sender_len:end].tobytes())
+            message = Message(
+                event_type=event_type,
+                payload=payload,
+                sender=sender,
+                priority=priority,
+                mono_ns=mono_ns_from_wall(wall)
+            )
+        yield end, message
+        offset = end
+
+
+def read(path, event_types=None):
+    """Yield the messages of one journal file without opening it for writing."""
+    with open(path, "rb") as f:
+        data = f.read()
+    for _, message in _scan(data, event_types):
+        if message is not None:
+            yield message
+
+
+def last_write(path):
+    """When a journal (either segment) was last written, or None if it has none."""
+    times = [os.path.getmtime(p) for p in (path + ".1", path) if os.path.isfile(p)]
+    return max(times, default=None)
+
+
+class Journal:
+    def __init__(self, path, fsync_interval=DEFAULT_FSYNC_INTERVAL,
+                 batch_size=DEFAULT_BATCH_SIZE, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.written = 0
+
+        self._truncate_torn_tail()
+        self._file = open(self.path, "ab")
+        self._pending = []
+        self._cond = threading.Condition()
+        self._running = True
+        self._writer = threading.Thread(target=self._writer_loop, name="Journal", daemon=True)
+        self._writer.start()
+
+    # ============ READING ============
+    def segments(self):
+        return [p for p in (self.path + ".1", self.path) if os.path.isfile(p)]
+
+    def replay(self, event_types=None):
+        """Yield journaled messages oldest first, optionally only some types."""
+        for segment in self.segments():
+            yield from read(segment, event_types)
+
+    def _truncate_torn_tail(self):
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        good = 0
+        for good, _ in _scan(data, event_types=()):
+            pass
+        if good < len(data):
+            print(f"[Journal] Dropping {len(data) - good} bytes of torn data from {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+
+    # ============ WRITING ============
+    def append(self, message):
+        with self._cond:
+            self._pending.append(message)
+            # Wake the writer for the first message of a batch and when full
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and self._running:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+                # Let the batch fill up, but never hold it past one interval
+                deadline = time.monotonic() + self.fsync_interval
+                while self._running and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+
+            self._write_batch(batch)
+            self._sync()
+
+    def _write_batch(self, batch):
+        records = []
+        for message in batch:
+            try:
+                records.append(encode(message))
+            except (TypeError, ValueError, struct.error) as e:
+                print(f"[Journal] Skipping {message.event_type}: {e}")
+        self._file.write(b"".join(records))
+        self.written += len(records)
+        if self._file.tell() >= self.max_bytes:
+            self._roll_over()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _roll_over(self):
+        self._sync()
+        self._file.close()
+        os.replace(self.path, self.path + ".1")
+        self._file = open(self.path, "ab")
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._writer.join()
+        self._file.close()
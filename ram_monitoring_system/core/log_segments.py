@@ -0,0 +1,193 @@
+"""
+Log Segments
+
+Rotation support for CsvLogWriter. When the live log rolls over it is
+renamed to a timestamped segment next to it,
+    ram_log.csv  ->  ram_log.20240101-100000-000000.csv  ->  ram_log.20240101-100000-000000.csv.gz
+and handed to a background thread that compresses it (gzip, or zstd when
+the zstandard package is installed) and then applies the retention limits.
+read_rows() streams the rows of every segment plus the live file, oldest
+first, decompressing on the fly, so a reader never holds a whole segment.
+"""
+
+import csv
+import gzip
+import io
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+
+COMPRESSED = {"gzip": ".gz", "zstd": ".zst"}
+CHUNK = 1024 * 1024
+
+
+def _split(path):
+    directory, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    return directory or ".", stem, ext
+
+
+def _pattern(path):
+    _, stem, ext = _split(path)
+    return re.compile(
+        rf"^{re.escape(stem)}\.(\d{{8}}-\d{{6}}-\d{{6}})(?:-(\d+))?{re.escape(ext)}(\.gz|\.zst)?$"
+    )
+
+
+def segments(path):
+    """Rolled segments of a log, oldest first (excluding the live file)."""
+    directory = _split(path)[0]
+    pattern = _pattern(path)
+    found = {}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if match is None:
+            continue
+        key = (match.group(1), int(match.group(2) or 0))
+        # While a segment is being compressed both files exist; prefer the
+        # plain one, which is complete until the compressed one replaces it
+        if key not in found or match.group(3) is None:
+            found[key] = os.path.join(directory, name)
+    return [found[key] for key in sorted(found)]
+
+
+def rolled_name(path):
+    # Named after the moment of the roll-over, to the microsecond, so names
+    # sort in the order the segments were written
+    directory, stem, ext = _split(path)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    name = os.path.join(directory, f"{stem}.{stamp}{ext}")
+    n = 1
+    while any(os.path.exists(name + suffix) for suffix in ("", *COMPRESSED.values())):
+        name = os.path.join(directory, f"{stem}.{stamp}-{n}{ext}")
+        n += 1
+    return name
+
+
+def _zstandard():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    if path.endswith(".zst"):
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is needed to read {path}")
+        raw = open(path, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True),
+                                newline="")
+    return open(path, newline="")
+
+
+def read_rows(path):
+    """Yield every row (as a dict) of a log and its rolled segments, oldest first."""
+    for segment in segments(path) + [path]:
+        candidates = [segment] if segment == path else [
+            segment, *(segment + suffix for suffix in COMPRESSED.values())
+        ]
+        for candidate in candidates:
+            try:
+                f = _open_text(candidate)
+            except FileNotFoundError:
+                # Compressed (and the plain file removed) since it was listed
+                continue
+            with f:
+                yield from csv.DictReader(f)
+            break
+
+
+class Compressor:
+    """Background thread that compresses rolled segments, then prunes old ones."""
+
+    def __init__(self, path, method="gzip", keep=None, max_age=None):
+        if method == "zstd" and _zstandard() is None:
+            print("[CsvLogWriter] zstandard not installed, compressing rolled logs with gzip")
+            method = "gzip"
+        if method is not None and method not in COMPRESSED:
+            raise ValueError(f"Unknown compression {method!r}, expected one of {tuple(COMPRESSED)}")
+        self.path = path
+        self.method = method
+        self.keep = keep            # Rolled segments kept; None = all
+        self.max_age = max_age      # Seconds a rolled segment is kept; None = forever
+        self._queue = queue.Queue()
+
+        # Finish what a previous run left behind: half-written archives go,
+        # segments still uncompressed are queued again
+        directory = _split(path)[0]
+        for name in os.listdir(directory):
+            if name.endswith(".tmp") and _pattern(path).match(name[:-4]):
+                os.remove(os.path.join(directory, name))
+        for segment in segments(path):
+            self.submit(segment)
+
+        self._thread = threading.Thread(target=self._loop, name="CsvLogCompressor", daemon=True)
+        self._thread.start()
+
+    def submit(self, segment):
+        self._queue.put(segment)
+
+    def _loop(self):
+        while True:
+            segment = self._queue.get()
+            if segment is None:
+                break
+            try:
+                if (self.method is not None and not segment.endswith((".gz", ".zst"))
+                        and os.path.isfile(segment)):   # Not pruned while queued
+                    self._compress(segment)
+                self._prune()
+            except OSError as e:
+                print(f"[CsvLogWriter] Could not compress {segment}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _compress(self, segment):
+        target = segment + COMPRESSED[self.method]
+        tmp = target + ".tmp"
+        with open(segment, "rb") as src, open(tmp, "wb") as raw:
+            if self.method == "gzip":
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, CHUNK)
+            else:
+                with _zstandard().ZstdCompressor().stream_writer(raw, closefd=False) as dst:
+                    shutil.copyfileobj(src, dst, CHUNK)
+            raw.flush()
+            os.fsync(raw.fileno())
+        # Keep the segment's age for max_age
+        stat = os.stat(segment)
+        os.utime(tmp, (stat.st_atime, stat.st_mtime))
+        os.replace(tmp, target)
+        os.remove(segment)
+
+    def _prune(self):
+        rolled = segments(self.path)
+        doomed = set()
+        if self.keep is not None and len(rolled) > self.keep:
+            doomed.update(rolled[:len(rolled) - self.keep])
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            doomed.update(s for s in rolled if os.path.getmtime(s) < cutoff)
+        for segment in doomed:
+            os.remove(segment)
+
+    def wait(self):
+        """Block until every submitted segment is compressed."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
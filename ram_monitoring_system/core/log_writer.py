@@ -0,0 +1,157 @@
+"""
+CSV Log Writer
+
+One writer thread per log file, fed from an in-memory queue, so any number
+of bus threads can log at once without interleaving rows and without doing
+file I/O themselves. The file stays open; queued rows are written in
+batches with one write call:
+    flush_interval  longest a row waits in memory before it is written
+    batch_size      write early once this many rows are queued
+    fsync_interval  None = leave it to the OS, 0 = fsync every batch,
+                    N = fsync at most every N seconds
+A crash can lose the rows still queued, and with fsync off whatever the
+OS had not written back yet.
+
+Optionally the file is rolled over past max_bytes and/or when the day
+changes. The writer thread only renames the file and opens a fresh one;
+compression and retention run on another thread (core/log_segments.py).
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+from datetime import date
+from core.log_segments import Compressor, rolled_name
+
+# ============ CONFIGURATION ============
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FSYNC_INTERVAL = None
+DEFAULT_COMPRESSION = "gzip"
+
+
+class CsvLogWriter:
+    def __init__(self, path, header, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 batch_size=DEFAULT_BATCH_SIZE, fsync_interval=DEFAULT_FSYNC_INTERVAL,
+                 max_bytes=None, daily=False, compression=DEFAULT_COMPRESSION,
+                 keep=None, max_age=None):
+        """
+        max_bytes: roll over once the file is this big; None = never
+        daily: also roll over at the first write of a new day
+        compression: "gzip", "zstd" or None for rolled files
+        keep / max_age: rolled files kept at most / seconds; None = no limit
+        """
+        self.path = path
+        self.header = header
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.written = 0
+        self.rolled = 0
+
+        self._compressor = None
+        if max_bytes is not None or daily:
+            self._compressor = Compressor(path, compression, keep=keep, max_age=max_age)
+        self._open()
+        # Rows are formatted into a reusable buffer and written in one call
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer)
+        self._last_sync = time.monotonic()
+
+        self._pending = []
+        self._queued = 0
+        self._flush_to = 0          # Rows flush() callers are waiting for
+        self._cond = threading.Condition()
+        self._running = True
+        self._writer = threading.Thread(target=self._writer_loop, name="CsvLogWriter", daemon=True)
+        self._writer.start()
+
+    def write(self, row):
+        with self._cond:
+            self._pending.append(row)
+            self._queued += 1
+            # Wake the writer for the first row of a batch and when full
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Block until every row queued so far is written to the file."""
+        with self._cond:
+            target = self._flush_to = self._queued
+            self._cond.notify_all()
+            while self.written < target and self._writer.is_alive():
+                self._cond.wait(0.1)
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and self._running:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+                # Let the batch fill up, but never hold it past one interval
+                deadline = time.monotonic() + self.flush_interval
+                while (self._running and len(self._pending) < self.batch_size
+                       and self._flush_to <= self.written):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+
+            self._write_batch(batch)
+            with self._cond:
+                self.written += len(batch)
+                self._cond.notify_all()
+
+    def _open(self):
+        new = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", newline="")
+        if new:
+            csv.writer(self._file).writerow(self.header)
+            self._file.flush()
+        # An existing file belongs to the day it was last written
+        self._day = date.fromtimestamp(os.path.getmtime(self.path))
+
+    def _should_roll(self):
+        if self.daily and date.today() != self._day:
+            return True
+        return self.max_bytes is not None and self._file.tell() >= self.max_bytes
+
+    def _roll_over(self):
+        self._file.close()
+        segment = rolled_name(self.path)
+        os.replace(self.path, segment)
+        self._open()
+        self.rolled += 1
+        self._compressor.submit(segment)
+
+    def _write_batch(self, batch):
+        # A backlog is written batch_size rows at a time, so the file still
+        # rolls over close to max_bytes
+        for i in range(0, len(batch), self.batch_size):
+            if self._compressor is not None and self._should_roll():
+                self._roll_over()
+            self._csv.writerows(batch[i:i + self.batch_size])
+            self._file.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self._file.flush()
+        if self.fsync_interval is not None:
+            now = time.monotonic()
+            if now - self._last_sync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_sync = now
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+        if self._compressor is not None:
+            self._compressor.close()
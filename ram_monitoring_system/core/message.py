@@ -1,10 +1,185 @@
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from core.topics import topic_root
 
-@dataclass
-class Message:
+# ============ PRIORITIES ============
+# Lower value is routed and dispatched first
+CRITICAL = 0
+NORMAL = 1
+LOW = 2
+
+# Looked up by topic root, so "RAM_DATA.web-01" is LOW like "RAM_DATA"
+DEFAULT_PRIORITIES = {
+    "RAM_HIGH": CRITICAL,
+    "RAM_NORMAL": CRITICAL,
+    "SEND_EMAIL": CRITICAL,
+    "RESTART": CRITICAL,
+    "RAM_BREACH_PREDICTED": CRITICAL,  # Only useful while it is early
+    "RAM_DATA": LOW,        # Telemetry must never delay escalation events
+}
+PRIORITY_CACHE_SIZE = 4096  # Distinct event types remembered before the cache is reset
+
+# event type -> default priority, so a message doesn't split its topic and
+# look up the root on every construction. Reset it after changing
+# DEFAULT_PRIORITIES at runtime
+_priority_cache = {}
+
+
+def default_priority(event_type):
+    priority = _priority_cache.get(event_type)
+    if priority is None:
+        if len(_priority_cache) >= PRIORITY_CACHE_SIZE:
+            _priority_cache.clear()
+        priority = _priority_cache[event_type] = DEFAULT_PRIORITIES.get(topic_root(event_type), NORMAL)
+    return priority
+
+# Messages are stamped with the cheap monotonic clock; wall time is derived
+# from it (only when someone asks) using this offset taken once at startup
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def mono_ns_from_wall(seconds):
+    """Monotonic timestamp for a wall-clock time, e.g. one read from disk."""
+    return int(seconds * 1_000_000_000) - _EPOCH_OFFSET_NS
+
+
+# ============ PAYLOAD RECORDS ============
+# Slotted records for the hot topics. They still support payload["key"],
+# so consumers written against dict payloads keep working.
+@dataclass(slots=True)
+class ProcessEntry:
+    name: str
+    memory: float           # % of RAM: RSS, or PSS when the PSS collector is on
+    pid: int = None
+    uss: float = None       # % of RAM only this process uses (PSS collector)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class ProcessGroup:
+    name: str               # Application, user or cgroup, by grouping mode
+    memory: float           # % of RAM (RSS) of all its processes
+    processes: int
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class MemoryPressure:
+    """Linux pressure signals; None where the source is not available."""
+    psi_some_avg10: float = None    # % of time some tasks stalled on memory
+    psi_some_avg60: float = None
+    psi_full_avg10: float = None    # % of time all tasks stalled on memory
+    psi_full_avg60: float = None
+    swap_percent: float = None
+    swap_in_per_sec: float = None   # Pages
+    swap_out_per_sec: float = None
+    cgroup_current: int = None      # Bytes
+    cgroup_max: int = None          # Bytes, None when unlimited
+    cgroup_max_events: int = None   # Times the cgroup hit memory.max since the last sample
+    cgroup_oom_kills: int = None    # OOM kills in the cgroup since the last sample
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    @property
+    def cgroup_percent(self):
+        if self.cgroup_current is None or not self.cgroup_max:
+            return None
+        return round(self.cgroup_current / self.cgroup_max * 100, 1)
+
+
+@dataclass(slots=True)
+class RamSample:
+    ram_percent: float
+    top_processes: list     # ProcessEntry, largest first
+    # Min/max/mean of the high-resolution samples since the previous tick
+    # (None when the monitor runs without the sampler)
+    ram_min: float = None
+    ram_max: float = None
+    ram_mean: float = None
+    pressure: MemoryPressure = None
+    top_groups: list = None     # ProcessGroup, largest first (when grouping is on)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    @property
+    def peak(self):
+        """Highest RAM percent seen since the previous tick."""
+        return self.ram_percent if self.ram_max is None else self.ram_max
+
+
+@dataclass(slots=True)
+class LeakSuspect:
+    """Payload of PROCESS_LEAK_SUSPECTED."""
+    pid: int
+    name: str
+    rss_mb: float
+    growth_mb_per_min: float
+    observed_seconds: int
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class BreachForecast:
+    """Payload of RAM_BREACH_PREDICTED."""
+    ram_percent: float          # Smoothed level when the forecast was made
+    threshold: float
+    seconds_to_breach: float
+    trend_per_min: float        # Percentage points per minute
+    top_processes: list         # ProcessEntry of the sample that triggered it
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+# ============ MESSAGES ============
+class _MessageBase:
+    __slots__ = ()
+
+    @property
+    def wall_time(self):
+        """Seconds since the epoch, like time.time()."""
+        return (self.mono_ns + _EPOCH_OFFSET_NS) / 1_000_000_000
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.wall_time)
+
+
+@dataclass(slots=True)
+class Message(_MessageBase):
+    event_type: str
+    payload: object
+    sender: str
+    priority: int = None
+    mono_ns: int = field(default_factory=time.monotonic_ns)
+
+    def __post_init__(self):
+        if self.priority is None:
+            priority = _priority_cache.get(self.event_type)
+            self.priority = default_priority(self.event_type) if priority is None else priority
+
+    def freeze(self):
+        return FrozenMessage(self.event_type, self.payload, self.sender, self.priority, self.mono_ns)
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenMessage(_MessageBase):
+    """Immutable Message, for subscribers that retain messages."""
     event_type: str
-    payload: dict
+    payload: object
     sender: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    priority: int = None
+    mono_ns: int = field(default_factory=time.monotonic_ns)
 
+    def __post_init__(self):
+        if self.priority is None:
+            object.__setattr__(self, "priority", default_priority(self.event_type))
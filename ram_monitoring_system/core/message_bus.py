@@ -1,40 +1,354 @@
+import dataclasses
+import itertools
 import queue
 import threading
+import time
+from collections import deque
+from core.metrics import BusMetrics
+from core.topics import TopicTrie, topic_root
+
+# ============ CONFIGURATION ============
+DEFAULT_WORKERS = 8          # Threads shared by all subscriber callbacks
+DEFAULT_MAX_CONCURRENCY = 1  # Callbacks of one subscriber running at once (1 = strict order)
+DEFAULT_LANE_SIZE = 100      # Pending events a subscriber may fall behind by
+DEFAULT_QUEUE_SIZE = 10000   # Published events waiting to be routed
+
+# ============ BACKPRESSURE POLICIES ============
+# What happens when an event arrives for a subscriber that has fallen
+# behind. Routing never waits for one subscriber: a full lane makes room,
+# sheds the event or, for events that must not be lost, grows past its bound
+KEEP_ALL = "keep_all"        # Never lost: queued past the bound (unbounded) while the subscriber lags
+DROP_OLDEST = "drop_oldest"  # Discard the oldest DROP_OLDEST event in a full lane (or this one)
+COALESCE = "coalesce"        # One pending event per callback and topic, replaced by newer ones;
+                             # outside the lane bound, so it never sheds another topic's event
+
+# Looked up by topic root, so "RAM_DATA.web-01" coalesces like "RAM_DATA"
+DEFAULT_POLICIES = {
+    "RAM_DATA": COALESCE,    # Gauge: a slow subscriber only needs the newest sample
+}
+NEVER_DROP = {"RAM_HIGH", "RAM_NORMAL", "SEND_EMAIL", "RESTART"}
+
+
+def resolve_policy(policy, event_type):
+    root = topic_root(event_type)
+    if root in NEVER_DROP:
+        return KEEP_ALL
+    if policy is None:
+        return DEFAULT_POLICIES.get(root, KEEP_ALL)
+    return policy
+
+
+class _Entry:
+    __slots__ = ("callback", "message", "enqueued_at", "policy", "stats")
+
+    def __init__(self, callback, message, enqueued_at, policy, stats):
+        self.callback = callback
+        self.message = message      # Replaced in place when a newer event coalesces
+        self.enqueued_at = enqueued_at
+        self.policy = policy
+        self.stats = stats          # SubscriberMetrics of the callback
+
+
+class _Lane:
+    """FIFO of pending callbacks for one subscriber (an agent or a plain function)."""
+
+    def __init__(self, name, max_concurrency, size):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.size = size
+        self.pending = deque()      # _Entry, oldest first
+        self.bounded = 0            # Entries in pending that count against size (all but COALESCE)
+        self.latest = {}            # (callback, event_type) -> its pending COALESCE entry
+        self.active = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.overflowed = 0         # KEEP_ALL events queued past the bound
+        self.overflowing = False
+        self.last_wait = 0.0
+        self.retired = False        # No subscriptions left; drains then goes away
+        self.lock = threading.Lock()
+
+    def offer(self, callback, message, policy, stats):
+        # Called with self.lock held. Returns True when a new entry was
+        # queued, False when the event was coalesced into a pending one or shed
+        if policy == COALESCE:
+            key = (callback, message.event_type)
+            entry = self.latest.get(key)
+            if entry is not None:
+                # Keeps its place in the FIFO, now carrying the newest event
+                entry.message = message
+                self.coalesced += 1
+                return False
+            entry = self.latest[key] = _Entry(callback, message, time.monotonic(), policy, stats)
+            self.pending.append(entry)
+            return True
+
+        if self.bounded >= self.size:
+            if policy == KEEP_ALL:
+                # Holding up the router here would stall every other
+                # subscriber behind this one, so the lane overflows instead
+                if not self.overflowing:
+                    self.overflowing = True
+                    print(f"[MessageBus] {self.name} is {self.bounded} events behind, "
+                          f"queuing past its limit of {self.size}")
+                self.overflowed += 1
+            elif not self._drop_oldest():
+                self.dropped += 1
+                return False
+
+        self.pending.append(_Entry(callback, message, time.monotonic(), policy, stats))
+        self.bounded += 1
+        return True
+
+    def take(self):
+        # Called with self.lock held; returns the oldest entry or None
+        if not self.pending:
+            return None
+        entry = self.pending.popleft()
+        if entry.policy == COALESCE:
+            del self.latest[(entry.callback, entry.message.event_type)]
+        else:
+            self.bounded -= 1
+            if self.bounded < self.size:
+                self.overflowing = False
+        return entry
+
+    def _drop_oldest(self):
+        for i, entry in enumerate(self.pending):
+            if entry.policy == DROP_OLDEST:
+                del self.pending[i]
+                self.bounded -= 1
+                self.dropped += 1
+                return True
+        return False
+
+    def oldest(self):
+        return self.pending[0] if self.pending else None
+
+    def stats(self):
+        with self.lock:
+            oldest = self.oldest()
+            lag = time.monotonic() - oldest.enqueued_at if oldest else 0.0
+            return {
+                "subscriber": self.name,
+                "depth": len(self.pending),
+                "lag": round(lag, 3),
+                "last_wait": round(self.last_wait, 3),
+                "active": self.active,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "overflowed": self.overflowed,
+            }
+
 
 class MessageBus:
-    def __init__(self):
-        self._queue = queue.Queue()
-        self._subscribers = {}
+    is_async = False
+
+    def __init__(self, workers=DEFAULT_WORKERS, lane_size=DEFAULT_LANE_SIZE,
+                 queue_size=DEFAULT_QUEUE_SIZE, journal=None):
+        # Bounded, so publishers slow down instead of memory growing forever.
+        # Entries are (priority, seq, published_at, message): critical events
+        # jump ahead of telemetry, and seq keeps FIFO order within a class
+        self._queue = queue.PriorityQueue(maxsize=queue_size)
+        self._seq = itertools.count()
+        self._lane_size = lane_size
+
+        # Copy-on-write routing state: subscribe/unsubscribe build new
+        # immutable snapshots under _lock and swap them in with a single
+        # assignment, so routing reads them without taking any lock
         self._lock = threading.Lock()
+        self._subscriptions = ()    # (pattern, lane, callback, policy, stats)
+        self._table = TopicTrie()
+        self._lanes = {}
         self._running = False
+        self.metrics = BusMetrics()
+        self.journal = journal      # Optional core.journal.Journal
+
+        # Lanes with work ready to run as (priority, seq, lane), drained by a
+        # fixed pool of worker threads
+        self._tasks = queue.PriorityQueue()
+        self._num_workers = workers
+        self._workers = []
 
 
-    def subscribe(self, event_type, callback):
+    def subscribe(self, pattern, callback, policy=None, max_concurrency=None):
+        # pattern is an event type or a wildcard pattern (see core/topics.py).
+        # Without an explicit policy each event gets its topic's default, and
+        # NEVER_DROP events are always delivered with KEEP_ALL
+        if policy not in (None, KEEP_ALL, DROP_OLDEST, COALESCE):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if policy not in (None, KEEP_ALL) and topic_root(pattern) in NEVER_DROP:
+            raise ValueError(f"{pattern} events must never be dropped (policy={policy})")
+
+        with self._lock:
+            lane = self._lane_for(callback)
+            if max_concurrency is not None:
+                lane.max_concurrency = max_concurrency
+            stats = self.metrics.subscriber(_callback_name(callback))
+            self._swap(self._subscriptions + ((pattern, lane, callback, policy, stats),))
+
+    def unsubscribe(self, pattern, callback):
+        # Returns False if callback wasn't subscribed to pattern. Events
+        # already queued for the callback are still delivered
         with self._lock:
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            self._subscribers[event_type].append(callback)
+            kept = tuple(
+                sub for sub in self._subscriptions
+                if not (sub[0] == pattern and sub[2] == callback)
+            )
+            if len(kept) == len(self._subscriptions):
+                return False
+            self._swap(kept)
+
+            in_use = {sub[1] for sub in kept}
+            retired = [lane for lane in self._lanes.values() if lane not in in_use]
+            self._lanes = {
+                owner: lane for owner, lane in self._lanes.items() if lane in in_use
+            }
+        for lane in retired:
+            self._retire_lane(lane)
+        return True
+
+    def _swap(self, subscriptions):
+        # Called with self._lock held. Build the new table completely before
+        # publishing it; routers holding the old one keep using it safely
+        table = TopicTrie()
+        for pattern, lane, callback, policy, stats in subscriptions:
+            table.add(pattern, (lane, callback, policy, stats))
+        self._subscriptions = subscriptions
+        self._table = table
+
+    def _lane_for(self, callback):
+        # Called with self._lock held. All callbacks of one agent share a
+        # lane, so e.g. RAM_HIGH and the RAM_NORMAL that follows it reach
+        # DashboardAgent in publish order
+        owner = getattr(callback, "__self__", callback)
+        lane = self._lanes.get(owner)
+        if lane is None:
+            name = getattr(owner, "name", None) or _callback_name(callback)
+            lane = _Lane(name, DEFAULT_MAX_CONCURRENCY, self._lane_size)
+            self._lanes = {**self._lanes, owner: lane}
+        return lane
 
-    def publish(self, message):
-        self._queue.put(message)
+    def _retire_lane(self, lane):
+        lane.retired = True
+
+    def publish(self, message, priority=None):
+        if priority is not None and priority != message.priority:
+            message = dataclasses.replace(message, priority=priority)
+        self.metrics.event(message.event_type).published += 1
+        if self.journal is not None:
+            self.journal.append(message)
+        self._queue.put((message.priority, next(self._seq), time.monotonic(), message))
+
+    def lane_stats(self):
+        return [lane.stats() for lane in self._lanes.values()]
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def metrics_snapshot(self):
+        snapshot = self.metrics.snapshot()
+        snapshot["queue_depth"] = self.queue_depth()
+        snapshot["lanes"] = self.lane_stats()
+        return snapshot
 
 
     def start_routing(self):
+        self._start_workers()
         self._running = True
         while self._running:
-            try:
-                message = self._queue.get(timeout=1.0)
-                self._route(message)
-            except queue.Empty:
-                continue
+            _, _, published_at, message = self._queue.get()
+            if message is None:
+                break
+            self.metrics.event(message.event_type).queue_wait.observe(time.monotonic() - published_at)
+            self._route(message)
 
 
+    def subscribers_for(self, event_type):
+        # Lock-free: one read of the current snapshot
+        return self._table.match(event_type)
+
     def _route(self, message):
+        for lane, callback, policy, stats in self.subscribers_for(message.event_type):
+            self._dispatch(lane, callback, message, resolve_policy(policy, message.event_type), stats)
+
+    def _dispatch(self, lane, callback, message, policy, stats):
+        # A full lane makes room according to the subscription's policy;
+        # it never holds up routing for the other subscribers
+        with lane.lock:
+            if not lane.offer(callback, message, policy, stats):
+                return
+            if lane.active >= lane.max_concurrency:
+                return
+            lane.active += 1
+        self._tasks.put((message.priority, next(self._seq), lane))
+
+    # ============ WORKER POOL ============
+    def _start_workers(self):
         with self._lock:
-            subscribers = self._subscribers.get(message.event_type, [])
+            if self._workers:
+                return
+            for i in range(self._num_workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"MessageBus-worker-{i}",
+                    daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
 
-        for callback in subscribers:
-            threading.Thread(target=callback, args=(message,), daemon=True).start()
+    def _worker_loop(self):
+        while True:
+            _, _, lane = self._tasks.get()
+            if lane is None:
+                break
+
+            with lane.lock:
+                entry = lane.take()
+                if entry is None:
+                    lane.active -= 1
+                    continue
+                started = time.monotonic()
+                lane.last_wait = started - entry.enqueued_at
+            callback, message, stats = entry.callback, entry.message, entry.stats
+            stats.lane_wait.observe(lane.last_wait)
+
+            try:
+                callback(message)
+            except Exception as e:
+                stats.errors += 1
+                print(f"[MessageBus] {_callback_name(callback)} failed on {message.event_type}: {e}")
+            stats.calls += 1
+            stats.duration.observe(time.monotonic() - started)
+
+            # Keep the lane's slot and requeue it behind other lanes at the
+            # priority of its next event, so one busy subscriber can't
+            # monopolise a worker
+            with lane.lock:
+                lane.delivered += 1
+                if not lane.pending:
+                    lane.active -= 1
+                    continue
+                priority = lane.oldest().message.priority
+            self._tasks.put((priority, next(self._seq), lane))
 
     def stop(self):
-        self._running = False
\ No newline at end of file
+        self._running = False
+        # Never wait on a full queue here: the router is then busy and sees
+        # _running before its next get()
+        try:
+            self._queue.put_nowait((-1, next(self._seq), 0.0, None))
+        except queue.Full:
+            pass
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._tasks.put((-1, next(self._seq), None))
+        if self.journal is not None:
+            self.journal.close()
+
+
+def _callback_name(callback):
+    return getattr(callback, "__qualname__", repr(callback))
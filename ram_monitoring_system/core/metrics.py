@@ -0,0 +1,113 @@
+"""
+Bus Metrics
+
+Always-on counters and latency histograms for the message bus. Updates are
+plain increments without locks, so they are cheap enough for production;
+under heavy contention a count can occasionally be off by one, which is
+fine for spotting a slow agent.
+"""
+
+from bisect import bisect_left
+from core.topics import topic_root
+
+# Bucket upper bounds in seconds: 10 us, 20 us, 40 us ... ~42 s
+BUCKETS = tuple(0.00001 * 2 ** i for i in range(23))
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)    # Last bucket: slower than all bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct):
+        # Upper bound of the bucket holding the pct-th observation, capped
+        # at the largest value actually seen
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class EventMetrics:
+    __slots__ = ("published", "queue_wait")
+
+    def __init__(self):
+        self.published = 0
+        self.queue_wait = Histogram()   # publish -> routed into subscriber lanes
+
+    def snapshot(self):
+        return {"published": self.published, "queue_wait": self.queue_wait.snapshot()}
+
+
+class SubscriberMetrics:
+    __slots__ = ("calls", "errors", "lane_wait", "duration")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.lane_wait = Histogram()    # routed -> handler started
+        self.duration = Histogram()     # handler execution time
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "lane_wait": self.lane_wait.snapshot(),
+            "duration": self.duration.snapshot(),
+        }
+
+
+class BusMetrics:
+    """Per event type (topic root) and per subscriber callback statistics."""
+
+    def __init__(self):
+        self.events = {}
+        self.subscribers = {}
+        self._by_topic = {}     # Full topic -> stats of its root, to skip the split
+
+    def event(self, topic):
+        stats = self._by_topic.get(topic)
+        if stats is None:
+            root = topic_root(topic)
+            stats = self.events.get(root)
+            if stats is None:
+                stats = self.events.setdefault(root, EventMetrics())
+            self._by_topic[topic] = stats
+        return stats
+
+    def subscriber(self, name):
+        stats = self.subscribers.get(name)
+        if stats is None:
+            stats = self.subscribers.setdefault(name, SubscriberMetrics())
+        return stats
+
+    def snapshot(self):
+        return {
+            "events": {topic: stats.snapshot() for topic, stats in list(self.events.items())},
+            "subscribers": {name: stats.snapshot() for name, stats in list(self.subscribers.items())},
+        }
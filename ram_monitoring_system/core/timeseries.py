@@ -0,0 +1,206 @@
+"""
+RAM Time Series Store
+
+Every RAM_DATA sample at full resolution, in a directory of append-only
+fixed-width column files:
+    time.i64    int64   milliseconds since the epoch, ascending
+    ram.u16     uint16  RAM percent x 100
+    swap.u16    uint16  swap percent x 100, 0xFFFF when unknown
+    top.u32     uint32  TOP_N process name ids per sample, 0xFFFFFFFF = none
+    names.txt           process names, one per line; the id is the line number
+That is 24 bytes per sample, about 62 MB for a month of 1 s samples.
+Appends are buffered and written every FLUSH_ROWS samples or FLUSH_INTERVAL
+seconds. Reads memory-map the columns and binary-search the time column,
+so a time-range lookup is O(log n) and returns zero-copy memoryviews.
+"""
+
+import math
+import mmap
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+# ============ CONFIGURATION ============
+TOP_N = 3
+FLUSH_ROWS = 64
+FLUSH_INTERVAL = 5.0
+
+NO_VALUE = 0xFFFF
+NO_NAME = 0xFFFFFFFF
+
+# name -> (typecode, values per sample)
+COLUMNS = {
+    "time.i64": ("q", 1),
+    "ram.u16": ("H", 1),
+    "swap.u16": ("H", 1),
+    "top.u32": ("I", TOP_N),
+}
+
+
+class Window:
+    """Samples in a time range; the columns are memoryviews into the files."""
+    __slots__ = ("times", "ram", "swap", "top", "_names")
+
+    def __init__(self, times, ram, swap, top, names):
+        self.times = times      # ms since the epoch
+        self.ram = ram          # percent x 100
+        self.swap = swap        # percent x 100, NO_VALUE when unknown
+        self.top = top          # TOP_N name ids per sample
+        self._names = names
+
+    def __len__(self):
+        return len(self.times)
+
+    def rows(self):
+        """(seconds since the epoch, ram %, swap % or None, [process names]) per sample."""
+        names = self._names
+        for i in range(len(self.times)):
+            swap = self.swap[i]
+            ids = self.top[i * TOP_N:(i + 1) * TOP_N]
+            yield (self.times[i] / 1000, self.ram[i] / 100,
+                   None if swap == NO_VALUE else swap / 100,
+                   [names[n] for n in ids if n != NO_NAME])
+
+
+class TimeSeriesStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._names = []
+        self._ids = {}
+        self._names_file = None
+        self._load_names()
+
+        # A crash can leave the columns at different lengths; keep the
+        # samples that made it into every column
+        rows = min(self._file_rows(column) for column in COLUMNS)
+        self._files = {}
+        for column, (typecode, width) in COLUMNS.items():
+            path = os.path.join(directory, column)
+            with open(path, "ab") as f:
+                f.truncate(rows * array(typecode).itemsize * width)
+            self._files[column] = open(path, "ab")
+        self._rows = rows                   # Samples on disk
+        self._last_time = self._read_last_time()
+
+        self._buffers = {column: array(typecode) for column, (typecode, _) in COLUMNS.items()}
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+
+        self._maps = {}                     # column -> (mmap, memoryview)
+        self._mapped_rows = 0
+        self._map_lock = threading.Lock()
+
+    def __len__(self):
+        return self._rows + self._buffered
+
+    # ============ WRITING ============
+    def append(self, timestamp, ram_percent, swap_percent, top_names):
+        """Add a sample; timestamp in seconds since the epoch, not older than the last one."""
+        ms = int(timestamp * 1000)
+        if ms < self._last_time:
+            return False
+        self._last_time = ms
+        buffers = self._buffers
+        buffers["time.i64"].append(ms)
+        buffers["ram.u16"].append(_hundredths(ram_percent))
+        buffers["swap.u16"].append(NO_VALUE if swap_percent is None else _hundredths(swap_percent))
+        ids = [self._name_id(name) for name in top_names[:TOP_N]]
+        ids += [NO_NAME] * (TOP_N - len(ids))
+        buffers["top.u32"].extend(ids)
+        self._buffered += 1
+        if (self._buffered >= FLUSH_ROWS
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL):
+            self.flush()
+        return True
+
+    def flush(self):
+        if self._buffered:
+            self._names_file.flush()
+            # Time goes last, so a sample is never found before its values
+            for column in ("ram.u16", "swap.u16", "top.u32", "time.i64"):
+                buffer = self._buffers[column]
+                f = self._files[column]
+                buffer.tofile(f)
+                f.flush()
+                del buffer[:]
+            self._rows += self._buffered
+            self._buffered = 0
+        self._last_flush = time.monotonic()
+
+    def _name_id(self, name):
+        id = self._ids.get(name)
+        if id is None:
+            id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._names_file.write(name.replace("\n", " ") + "\n")
+        return id
+
+    # ============ READING ============
+    def range(self, start=None, end=None):
+        """Window of the flushed samples with start <= time < end (seconds, None = open)."""
+        views = self._views()
+        times = views["time.i64"]
+        lo = 0 if start is None else bisect_left(times, int(start * 1000))
+        hi = len(times) if end is None else bisect_left(times, int(end * 1000), lo)
+        return Window(times[lo:hi], views["ram.u16"][lo:hi], views["swap.u16"][lo:hi],
+                      views["top.u32"][lo * TOP_N:hi * TOP_N], self._names)
+
+    def _views(self):
+        rows = self._rows
+        with self._map_lock:
+            if rows != self._mapped_rows or not self._maps:
+                self._remap(rows)
+            return {column: view[:rows * COLUMNS[column][1]]
+                    for column, (_, view) in self._maps.items()}
+
+    def _remap(self, rows):
+        # Called with _map_lock held. Old maps are left for the garbage
+        # collector, since windows handed out may still point into them
+        maps = {}
+        for column, (typecode, width) in COLUMNS.items():
+            size = rows * array(typecode).itemsize * width
+            if size == 0:
+                maps[column] = (None, memoryview(array(typecode)))
+                continue
+            with open(os.path.join(self.directory, column), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            maps[column] = (mapped, memoryview(mapped).cast(typecode))
+        self._maps = maps
+        self._mapped_rows = rows
+
+    def _file_rows(self, column):
+        typecode, width = COLUMNS[column]
+        path = os.path.join(self.directory, column)
+        size = os.path.getsize(path) if os.path.isfile(path) else 0
+        return size // (array(typecode).itemsize * width)
+
+    def _read_last_time(self):
+        if not self._rows:
+            return -math.inf
+        with open(os.path.join(self.directory, "time.i64"), "rb") as f:
+            f.seek((self._rows - 1) * 8)
+            last = array("q")
+            last.frombytes(f.read(8))
+        return last[0]
+
+    def _load_names(self):
+        path = os.path.join(self.directory, "names.txt")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    self._ids[line[:-1]] = len(self._names)
+                    self._names.append(line[:-1])
+        self._names_file = open(path, "a", encoding="utf-8")
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._names_file.close()
+
+
+def _hundredths(percent):
+    return min(max(int(round(percent * 100)), 0), 10000)
@@ -0,0 +1,80 @@
+"""
+Topic Matching
+
+Event types are dot-separated topics, e.g. "ram.alert.high" or
+"RAM_DATA.web-01". Subscription patterns may use wildcards:
+    *  matches exactly one segment        ram.alert.*
+    #  matches zero or more segments      RAM_DATA.#   or just  #  (everything)
+Plain names like "RAM_DATA" are one-segment topics and match exactly.
+"""
+
+SEPARATOR = "."
+ONE = "*"
+MANY = "#"
+
+# ============ CONFIGURATION ============
+MATCH_CACHE_SIZE = 4096     # Distinct topics remembered before the cache is reset
+
+
+def topic_root(topic):
+    """First segment of a topic: "RAM_DATA.web-01" -> "RAM_DATA"."""
+    return topic.split(SEPARATOR, 1)[0]
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children = {}
+        self.values = []        # (seq, value) subscribed at exactly this pattern
+
+
+class TopicTrie:
+    """
+    Maps subscription patterns to values. Patterns are stored in a trie keyed
+    by segment, and the result for each concrete topic is cached, so routing
+    a message is one dict lookup no matter how many patterns exist.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._seq = 0
+        self._cache = {}
+
+    def add(self, pattern, value):
+        node = self._root
+        for segment in pattern.split(SEPARATOR):
+            node = node.children.setdefault(segment, _Node())
+        node.values.append((self._seq, value))
+        self._seq += 1
+        self._cache.clear()
+
+    def match(self, topic):
+        result = self._cache.get(topic)
+        if result is None:
+            found = {}
+            self._collect(self._root, topic.split(SEPARATOR), 0, found)
+            # Subscription order, independent of which wildcard matched
+            result = tuple(found[seq] for seq in sorted(found))
+            if len(self._cache) >= MATCH_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[topic] = result
+        return result
+
+    def _collect(self, node, segments, i, found):
+        many = node.children.get(MANY)
+        if many is not None:
+            # "#" swallows any number of the remaining segments, including none
+            for j in range(i, len(segments) + 1):
+                self._collect(many, segments, j, found)
+
+        if i == len(segments):
+            found.update(node.values)
+            return
+
+        child = node.children.get(segments[i])
+        if child is not None:
+            self._collect(child, segments, i + 1, found)
+        one = node.children.get(ONE)
+        if one is not None:
+            self._collect(one, segments, i + 1, found)
@@ -1,79 +1,205 @@
+import argparse
+import asyncio
 import threading
 import time
 import os
+from collectors.grouping import MODES
+from collectors.procfs import ProcfsCollector
+from collectors.psutil_collector import PsutilCollector
+from collectors.simulated import SyntheticSource, TraceSource
+from collectors.smaps import PssCollector
+from core.async_bus import AsyncMessageBus, nonblocking
+from core.escalation import Condition, EscalationEngine, Rule, Step
+from core.forecast import BreachForecaster
+from core.journal import Journal, last_write
 from core.message_bus import MessageBus
 from core.message import Message
-from agents.monitor_agent import MonitorAgent
+from agents.monitor_agent import MonitorAgent, GROUP_BY, MAX_INTERVAL
 from agents.alert_agent import AlertAgent
 from agents.email_agent import EmailAgent
 from agents.dashboard_agent import DashboardAgent
 from agents.logger_agent import LoggerAgent
 from agents.recovery_agent import RestartAgent
-
-ram_high_since = None
-email_sent = False
-restart_triggered = False
-
-
+from agents.simulator_agent import SimulatorAgent
+
+RAM_THRESHOLD = 50          # % of RAM (peak) that starts a breach
+RAM_CLEAR = 45              # % of RAM the breach ends below
+
+# Memory pressure escalates like a high percentage (Linux only)
+PSI_SOME_THRESHOLD = 20.0   # % of the last 10s some tasks stalled on memory
+PSI_FULL_THRESHOLD = 5.0    # % of the last 10s all tasks stalled on memory
+SWAP_IN_THRESHOLD = 1000    # Pages swapped in per second
+CGROUP_THRESHOLD = 90       # % of the container's memory.max
+
+# Evaluated per host on every RAM_DATA sample (see core/escalation.py)
+ESCALATION_RULES = (
+    Rule(
+        "memory",
+        conditions=(
+            # Peak of the high-resolution samples, so spikes between ticks
+            # count; the tick reading must hold the breach and confirm it
+            # before anything drastic happens
+            Condition("peak", RAM_THRESHOLD, clear=RAM_CLEAR, sustained="ram_percent"),
+            Condition("pressure.psi_some_avg10", PSI_SOME_THRESHOLD),
+            Condition("pressure.psi_full_avg10", PSI_FULL_THRESHOLD),
+            Condition("pressure.swap_in_per_sec", SWAP_IN_THRESHOLD),
+            Condition("pressure.cgroup_percent", CGROUP_THRESHOLD),
+            # Hitting the cgroup limit or an OOM kill is trouble regardless of averages
+            Condition("pressure.cgroup_max_events", 1),
+            Condition("pressure.cgroup_oom_kills", 1),
+        ),
+        steps=(
+            Step(0, "RAM_HIGH", "warning"),
+            Step(20, "SEND_EMAIL", "critical", cooldown=300, confirm=True),
+            Step(30, "RESTART", "emergency", cooldown=600, confirm=True),
+        ),
+        clear_event="RAM_NORMAL",
+    ),
+)
+
+escalation = EscalationEngine(ESCALATION_RULES)
+# A breach restored from a journal last written longer ago than this is
+# dropped: a long-dead process must not reboot the machine on its first sample
+RESTORE_MAX_AGE = max(step.after for rule in ESCALATION_RULES for step in rule.steps) + MAX_INTERVAL
+# Publishes RAM_BREACH_PREDICTED while RAM is still rising towards the threshold
+forecaster = BreachForecaster(RAM_THRESHOLD)
+
+LOCAL_HOST = ""     # RAM_DATA from this machine; simulated hosts publish RAM_DATA.<host>
+
+
+def restore_escalation_state(messages, last_seen, now=None):
+    # Rebuild escalation state from journaled escalation events, so a
+    # restart neither resets the breach timer nor re-sends the email.
+    # last_seen is when the journal was last written, i.e. when the
+    # previous run was last alive
+    for message in messages:
+        escalation.restore(LOCAL_HOST, message.event_type, message.wall_time)
+
+    breach = escalation.breach(LOCAL_HOST, "memory")
+    now = time.time() if now is None else now
+    if breach is not None and (last_seen is None or now - last_seen > RESTORE_MAX_AGE):
+        print(f"[MAIN] Journal is older than {RESTORE_MAX_AGE}s, not restoring the breach it recorded")
+        escalation.reset(LOCAL_HOST)
+        breach = None
+    if breach is not None:
+        since, steps = breach
+        print(f"[MAIN] Restored breach from journal: RAM high since "
+              f"{time.strftime('%H:%M:%S', time.localtime(since))}, "
+              f"{steps} escalation step(s) already taken")
+
+
+@nonblocking
 def on_ram_data(message):
-    global ram_high_since, email_sent, restart_triggered
-    ram = message.payload['ram_percent']
-    processes = message.payload['top_processes']
-
-
-    if ram >= 50:
-        if ram_high_since is None:
-            ram_high_since = time.time()
-            email_sent = False
-            restart_triggered = False
-            bus.publish(Message(
-                event_type="RAM_HIGH",
-                payload={"ram_percent": ram, "top_processes": processes},
-                sender="main"
-            ))
-
-        duration = time.time() - ram_high_since
-
-        if duration >= 20 and not email_sent:
-            email_sent = True
-            bus.publish(Message(
-                event_type="SEND_EMAIL",
-                payload={"ram_percent": ram, "top_processes": processes},
-                sender="main"
-            ))
-
-        if duration >= 30 and not restart_triggered:
-            restart_triggered = True
-            bus.publish(Message(
-                event_type="RESTART",
-                payload={"ram_percent": ram, "top_processes": processes},
-                sender="main"
-            ))
-    else:
-        if ram_high_since is not None:
-            ram_high_since = None
-            email_sent = False
-            restart_triggered = False
-            bus.publish(Message(
-                event_type="RAM_NORMAL",
-                payload={"ram_percent": ram, "top_processes": processes},
-                sender="main"
-            ))
+    # "RAM_DATA" is this machine, "RAM_DATA.web-01" a remote or simulated host
+    host = message.event_type[len("RAM_DATA."):]
+    # Timers run on when the sample was taken, not when it got here, so
+    # they stay exact however far apart the monitor spaces its samples
+    for event, severity in escalation.evaluate(host, message.payload, message.wall_time):
+        print(f"[MAIN] {host or 'local'}: {event} ({severity})")
+        # Escalation events carry the RamSample that triggered them as-is
+        bus.publish(Message(
+            event_type=f"{event}.{host}" if host else event,
+            payload=message.payload,
+            sender="main"
+        ))
+
+    forecast = forecaster.update(host, message.payload, message.wall_time)
+    if forecast is not None:
+        print(f"[MAIN] {host or 'local'}: RAM predicted to reach {forecast.threshold}% "
+              f"in {forecast.seconds_to_breach:.0f}s (+{forecast.trend_per_min}%/min)")
+        bus.publish(Message(
+            event_type=f"RAM_BREACH_PREDICTED.{host}" if host else "RAM_BREACH_PREDICTED",
+            payload=forecast,
+            sender="main"
+        ))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="RAM Monitoring System")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="run every agent on one asyncio event loop instead of threads")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="journal every bus message to PATH and restore escalation state from it")
+    parser.add_argument("--procfs", action="store_true",
+                        help="read /proc directly instead of using psutil (Linux only)")
+    parser.add_argument("--pss", action="store_true",
+                        help="rank top processes by PSS from smaps_rollup instead of RSS (Linux only)")
+    parser.add_argument("--group-by", choices=MODES + ("none",), default=GROUP_BY or "none",
+                        help="aggregate memory by application, process tree, user or cgroup")
+    parser.add_argument("--headless", action="store_true",
+                        help="no tray icon or popups, for servers without a desktop session")
+    parser.add_argument("--simulate", metavar="HOSTS", type=int,
+                        help="load test: publish synthetic samples for HOSTS hosts instead of monitoring "
+                             "this machine; never emails or restarts")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="with --simulate, replay a ram_log.csv or a journal for every host "
+                             "instead of synthetic load")
+    parser.add_argument("--speed", type=float, default=60,
+                        help="simulated seconds per second with --simulate (0 = as fast as possible)")
+    parser.add_argument("--duration", type=float, metavar="SECONDS",
+                        help="simulated seconds to run with --simulate (default: until the trace ends "
+                             "or forever)")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     print("=" * 55)
     print("   RAM MONITORING SYSTEM")
     print("=" * 55)
 
+    journal = None
+    if args.journal:
+        # Before opening: truncating a torn tail would touch the file
+        last_seen = last_write(args.journal)
+        journal = Journal(args.journal)
+        restore_escalation_state(journal.replay(escalation.event_types()), last_seen)
+
     global bus
-    bus = MessageBus()
+    bus = AsyncMessageBus(journal=journal) if args.use_async else MessageBus(journal=journal)
+
+    # RAM_DATA from this machine, RAM_DATA.<host> from simulated hosts
+    bus.subscribe("RAM_DATA.#", on_ram_data)
 
-    bus.subscribe("RAM_DATA", on_ram_data)
+    if args.simulate:
+        agents = simulation_agents(args)
+    else:
+        agents = monitoring_agents(args)
 
-    agents = [
-        MonitorAgent(bus),
-        AlertAgent(bus),
+    try:
+        if args.use_async:
+            asyncio.run(run_async(agents))
+        else:
+            run_threaded(agents)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Closes the journal, then lets agents flush what they buffer
+        bus.stop()
+        for agent in agents:
+            agent.stop()
+    print("\n[MAIN] System stopped.")
+    os._exit(0)
+
+
+def monitoring_agents(args):
+    collector = None
+    if args.procfs:
+        if ProcfsCollector.supported():
+            collector = ProcfsCollector()
+        else:
+            print("[MAIN] /proc not available, falling back to psutil")
+    if args.pss:
+        if PssCollector.supported():
+            collector = PssCollector(collector or PsutilCollector())
+        else:
+            print("[MAIN] smaps_rollup not available, ranking processes by RSS")
+
+    return [
+        MonitorAgent(bus, collector=collector, headless=args.headless,
+                     group_by=None if args.group_by == "none" else args.group_by),
+        AlertAgent(bus, headless=args.headless),
         EmailAgent(bus),
         DashboardAgent(bus),
         LoggerAgent(bus),
@@ -81,6 +207,22 @@ def main():
 
     ]
 
+
+def simulation_agents(args):
+    # Only agents that stay on this machine: no popups, emails or restarts
+    # for hosts that don't exist
+    if args.replay:
+        sources = {f"host-{i}": TraceSource(args.replay) for i in range(args.simulate)}
+    else:
+        sources = {f"host-{i}": SyntheticSource(seed=i) for i in range(args.simulate)}
+    return [
+        SimulatorAgent(bus, sources, speed=args.speed, duration=args.duration),
+        DashboardAgent(bus),
+        LoggerAgent(bus),
+    ]
+
+
+def run_threaded(agents):
     threading.Thread(target=bus.start_routing, name="MessageBus", daemon=True).start()
 
     for agent in agents:
@@ -88,15 +230,18 @@ def main():
 
     print("\n[MAIN] All agents running. Press Ctrl+C to stop.\n")
 
-    try:
-        while True:
-            time.sleep(30)
-    except KeyboardInterrupt:
-        bus.stop()
-        print("\n[MAIN] System stopped.")
-        import os
-        os._exit(0)
+    while True:
+        time.sleep(30)
+
+
+async def run_async(agents):
+    for agent in agents:
+        agent.start()
+
+    print("\n[MAIN] All agents running on one event loop. Press Ctrl+C to stop.\n")
+
+    await bus.start_routing()
 
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
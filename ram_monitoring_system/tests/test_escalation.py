@@ -0,0 +1,103 @@
+"""
+Escalation rules in main.py: spikes against sustained RAM, and state
+restored from a journal after a restart.
+
+Run from the ram_monitoring_system folder:
+    python -m unittest discover tests
+"""
+
+import unittest
+from types import SimpleNamespace
+
+import main
+from core.escalation import EscalationEngine
+from core.message import RamSample
+
+
+def journaled(event_type, at):
+    # All restore_escalation_state reads of a journaled message
+    return SimpleNamespace(event_type=event_type, wall_time=at)
+
+
+def events(fired):
+    return [event for event, _ in fired]
+
+
+class SpikeEscalationTest(unittest.TestCase):
+    def setUp(self):
+        main.escalation = EscalationEngine(main.ESCALATION_RULES)
+
+    def evaluate(self, ram, now, ram_max=None):
+        sample = RamSample(ram, [], ram_max=ram_max)
+        return events(main.escalation.evaluate(main.LOCAL_HOST, sample, now))
+
+    def test_spike_then_plateau_never_restarts(self):
+        # One 50 ms spike to 50%, then ticks at 46%: above the clear level
+        # but never above the threshold
+        self.assertEqual(self.evaluate(46.0, 0, ram_max=50.0), ["RAM_HIGH"])
+        for now in range(5, 65, 5):
+            self.assertEqual(self.evaluate(46.0, now, ram_max=46.5), [], now)
+        self.assertEqual(self.evaluate(44.0, 65, ram_max=44.5), ["RAM_NORMAL"])
+
+    def test_spike_alone_clears(self):
+        self.assertEqual(self.evaluate(40.0, 0, ram_max=52.0), ["RAM_HIGH"])
+        self.assertEqual(self.evaluate(40.0, 5, ram_max=40.5), ["RAM_NORMAL"])
+
+    def test_sustained_breach_escalates(self):
+        self.assertEqual(self.evaluate(55.0, 0), ["RAM_HIGH"])
+        self.assertEqual(self.evaluate(55.0, 20), ["SEND_EMAIL"])
+        self.assertEqual(self.evaluate(55.0, 30), ["RESTART"])
+
+    def test_escalation_waits_for_confirmation(self):
+        self.assertEqual(self.evaluate(46.0, 0, ram_max=50.0), ["RAM_HIGH"])
+        self.assertEqual(self.evaluate(46.0, 25), [])
+        # RAM really is high from t=40: the steps count from there
+        self.assertEqual(self.evaluate(51.0, 40), [])
+        self.assertEqual(self.evaluate(51.0, 55), [])
+        self.assertEqual(self.evaluate(51.0, 60), ["SEND_EMAIL"])
+        self.assertEqual(self.evaluate(51.0, 70), ["RESTART"])
+
+
+class RestoreEscalationTest(unittest.TestCase):
+    def setUp(self):
+        main.escalation = EscalationEngine(main.ESCALATION_RULES)
+
+    def evaluate(self, ram, now):
+        return events(main.escalation.evaluate(main.LOCAL_HOST, RamSample(ram, []), now))
+
+    def test_stale_breach_is_dropped(self):
+        # Crashed a day ago just after RAM_HIGH: the first sample must not
+        # email or reboot, least of all below the threshold
+        main.restore_escalation_state([journaled("RAM_HIGH", 0)], last_seen=0, now=86400)
+        self.assertIsNone(main.escalation.breach(main.LOCAL_HOST, "memory"))
+        self.assertEqual(self.evaluate(46.0, 86400), [])
+        self.assertEqual(self.evaluate(60.0, 86401), ["RAM_HIGH"])
+
+    def test_stale_breach_keeps_cooldowns(self):
+        main.restore_escalation_state([journaled("RAM_HIGH", 0), journaled("SEND_EMAIL", 20)],
+                                      last_seen=25, now=100)
+        self.assertEqual(self.evaluate(60.0, 100), ["RAM_HIGH"])
+        # The email sent before the restart is still within its cooldown
+        self.assertEqual(self.evaluate(60.0, 120), [])
+
+    def test_recent_breach_continues(self):
+        main.restore_escalation_state([journaled("RAM_HIGH", 100)], last_seen=105, now=110)
+        self.assertEqual(main.escalation.breach(main.LOCAL_HOST, "memory"), (100, 1))
+        self.assertEqual(self.evaluate(60.0, 110), [])
+        self.assertEqual(self.evaluate(60.0, 120), ["SEND_EMAIL"])
+
+    def test_first_sample_rechecks_restored_breach(self):
+        # 46% is above the clear level but below the threshold: a restored
+        # breach is not kept alive by hysteresis alone
+        main.restore_escalation_state([journaled("RAM_HIGH", 100)], last_seen=105, now=110)
+        self.assertEqual(self.evaluate(46.0, 110), ["RAM_NORMAL"])
+        self.assertEqual(self.evaluate(46.0, 140), [])
+
+    def test_hysteresis_after_confirmation(self):
+        main.restore_escalation_state([journaled("RAM_HIGH", 100)], last_seen=105, now=110)
+        self.assertEqual(self.evaluate(60.0, 110), [])
+        self.assertEqual(self.evaluate(46.0, 115), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+MessageBus lanes: delivery order and backpressure policies while a
+subscriber is stalled.
+
+Run from the ram_monitoring_system folder:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import threading
+import time
+import unittest
+
+from core.message_bus import MessageBus, COALESCE, DROP_OLDEST, KEEP_ALL
+from core.message import Message
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+class StalledSubscriber:
+    """Records payloads; holds the first call until released."""
+
+    def __init__(self):
+        self.received = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def __call__(self, message):
+        self.started.set()
+        self.gate.wait()
+        self.received.append(message.payload)
+
+
+class LaneTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = MessageBus(lane_size=3)
+        self.stdout = contextlib.redirect_stdout(io.StringIO())
+        self.stdout.__enter__()
+
+    def tearDown(self):
+        self.bus.stop()
+        self.stdout.__exit__(None, None, None)
+
+    def start(self):
+        threading.Thread(target=self.bus.start_routing, daemon=True).start()
+
+    def settle(self):
+        # Let the router hand every published event to its lanes
+        wait_until(lambda: not self.bus.queue_depth())
+        time.sleep(0.05)
+
+    def lane(self):
+        return self.bus.lane_stats()[0]
+
+    def test_publish_order(self):
+        subscriber = StalledSubscriber()
+        subscriber.gate.set()
+        self.bus.subscribe("EVT", subscriber, policy=KEEP_ALL)
+        self.start()
+        for i in range(50):
+            self.bus.publish(Message("EVT", i, "test"))
+        wait_until(lambda: len(subscriber.received) == 50)
+        self.assertEqual(subscriber.received, list(range(50)))
+
+    def test_coalesce_keeps_newest_per_topic(self):
+        subscriber = StalledSubscriber()
+        self.bus.subscribe("RAM_DATA.#", subscriber)    # COALESCE by default
+        self.start()
+        self.bus.publish(Message("RAM_DATA.host-0", "first", "test"))
+        subscriber.started.wait(5)
+
+        # Many more hosts than the lane holds, three samples each
+        hosts = 300
+        for sample in range(3):
+            for host in range(hosts):
+                self.bus.publish(Message(f"RAM_DATA.host-{host}", (host, sample), "test"))
+        self.settle()
+        lane = self.lane()
+        self.assertEqual(lane["depth"], hosts)
+        self.assertEqual(lane["dropped"], 0)
+        self.assertEqual(lane["coalesced"], hosts * 2)
+
+        subscriber.gate.set()
+        wait_until(lambda: len(subscriber.received) == hosts + 1)
+        # Every host's newest sample, in the order the hosts first queued
+        self.assertEqual(subscriber.received, ["first"] + [(host, 2) for host in range(hosts)])
+
+    def test_coalesce_leaves_no_tombstones(self):
+        subscriber = StalledSubscriber()
+        self.bus.subscribe("RAM_DATA", subscriber, policy=COALESCE)
+        self.start()
+        self.bus.publish(Message("RAM_DATA", -1, "test"))
+        subscriber.started.wait(5)
+        for i in range(5000):
+            self.bus.publish(Message("RAM_DATA", i, "test"))
+        self.settle()
+        lane = next(iter(self.bus._lanes.values()))
+        self.assertEqual(len(lane.pending), 1)
+        subscriber.gate.set()
+        wait_until(lambda: len(subscriber.received) == 2)
+        self.assertEqual(subscriber.received, [-1, 4999])
+
+    def test_drop_oldest(self):
+        subscriber = StalledSubscriber()
+        self.bus.subscribe("EVT", subscriber, policy=DROP_OLDEST)
+        self.start()
+        self.bus.publish(Message("EVT", 0, "test"))
+        subscriber.started.wait(5)
+        for i in range(1, 10):
+            self.bus.publish(Message("EVT", i, "test"))
+        self.settle()
+        lane = next(iter(self.bus._lanes.values()))
+        self.assertEqual(len(lane.pending), 3)
+        self.assertEqual(self.lane()["dropped"], 6)
+
+        subscriber.gate.set()
+        wait_until(lambda: len(subscriber.received) == 4)
+        self.assertEqual(subscriber.received, [0, 7, 8, 9])
+
+    def test_drop_oldest_sheds_new_event_behind_keep_all(self):
+        subscriber = StalledSubscriber()
+        self.bus.subscribe("EVT", subscriber, policy=KEEP_ALL)
+        self.bus.subscribe("LOSSY", subscriber, policy=DROP_OLDEST)
+        self.start()
+        self.bus.publish(Message("EVT", 0, "test"))
+        subscriber.started.wait(5)
+        for i in range(1, 4):
+            self.bus.publish(Message("EVT", i, "test"))
+        self.bus.publish(Message("LOSSY", "lost", "test"))
+        self.settle()
+
+        subscriber.gate.set()
+        wait_until(lambda: len(subscriber.received) == 4)
+        time.sleep(0.05)
+        self.assertEqual(subscriber.received, [0, 1, 2, 3])
+        self.assertEqual(self.lane()["dropped"], 1)
+
+    def test_keep_all_overflows_without_stalling_others(self):
+        stalled = StalledSubscriber()
+        other = StalledSubscriber()
+        other.gate.set()
+        self.bus.subscribe("RAM_HIGH", stalled)
+        self.bus.subscribe("RAM_DATA", other, policy=KEEP_ALL)
+        self.start()
+        for i in range(20):
+            self.bus.publish(Message("RAM_HIGH", i, "test"))
+        for i in range(5):
+            self.bus.publish(Message("RAM_DATA", i, "test"))
+        wait_until(lambda: len(other.received) == 5)
+
+        stalled.gate.set()
+        wait_until(lambda: len(stalled.received) == 20)
+        self.assertEqual(stalled.received, list(range(20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
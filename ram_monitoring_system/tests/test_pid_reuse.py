@@ -0,0 +1,44 @@
+"""
+Scan observers when a PID is reused between ticks: the new process must not
+inherit the old one's group or RSS trend.
+
+Run from the ram_monitoring_system folder:
+    python -m unittest discover tests
+"""
+
+import os
+import unittest
+
+from collectors.grouping import ProcessGrouper
+from collectors.leak_detector import LeakDetector
+
+MB = 1024 * 1024
+
+
+class PidReuseTest(unittest.TestCase):
+    def scan(self, observer, now, *samples):
+        observer.begin(now)
+        for sample in samples:
+            observer.observe(*sample)
+        return observer.end()
+
+    def test_grouper_rejoins_reused_pid(self):
+        grouper = ProcessGrouper("name")
+        pid = os.getpid()
+        self.scan(grouper, 0, (pid, 300 * MB, 1000))
+        self.scan(grouper, 5, (pid, 20 * MB, 2000))
+        [group] = grouper.top(5)
+        self.assertEqual(group.processes, 1)
+        self.assertEqual(group.memory, round(20 * MB * 100 / grouper.total, 2))
+
+    def test_leak_trend_restarts_for_reused_pid(self):
+        detector = LeakDetector()
+        self.scan(detector, 0, (42, 100 * MB, 1000))
+        self.scan(detector, 5, (42, 100 * MB, 1000))
+        self.scan(detector, 10, (42, 400 * MB, 2000))
+        self.assertEqual(detector._trends[42].first_seen, 10)
+        self.assertEqual(detector._trends[42].slope(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()